@@ -0,0 +1,68 @@
+"""Сравнение JSONRenderer DRF с FastJSONRenderer и MessagePackRenderer.
+
+Запуск: python benchmarks/renderers.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django.setup()
+    setup_django.create_posts(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from api.renderers import (
+        FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+    )
+    from posts.models import Comment, Post
+    from posts.serializers import CommentSerializer, PostSerializer
+
+    renderers = [("drf-json", JSONRenderer())]
+    if orjson is not None:
+        renderers.append(("orjson", FastJSONRenderer()))
+    if msgpack is not None:
+        renderers.append(("msgpack", MessagePackRenderer()))
+
+    request = APIRequestFactory().get(
+        "/api/v1/posts/", SERVER_NAME="localhost"
+    )
+    context = {"request": request}
+    for serializer_class, model in (
+        (PostSerializer, Post),
+        (CommentSerializer, Comment),
+    ):
+        data = serializer_class(
+            model.objects.select_related("author").order_by("id"),
+            many=True,
+            context=context,
+        ).data
+        baseline = None
+        for name, renderer in renderers:
+            size = len(renderer.render(data))
+            elapsed = min(timeit.repeat(
+                lambda: renderer.render(data), number=1, repeat=args.repeat
+            ))
+            baseline = baseline or elapsed
+            print(
+                f"{serializer_class.__name__:<18} {name:<9} "
+                f"rows={args.rows} time={elapsed * 1000:8.1f} ms  "
+                f"size={size / 1024:8.1f} KiB  "
+                f"speedup={baseline / elapsed:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
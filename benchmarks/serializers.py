@@ -0,0 +1,66 @@
+"""Сравнение PostSerializer/CommentSerializer с ValuesRepresentation.
+
+Запуск: python benchmarks/serializers.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django.setup()
+    setup_django.create_posts(args.rows)
+
+    from rest_framework.test import APIRequestFactory
+
+    from posts.fastpath import ValuesRepresentation
+    from posts.models import Comment, Post
+    from posts.serializers import CommentSerializer, PostSerializer
+
+    request = APIRequestFactory().get(
+        "/api/v1/posts/", SERVER_NAME="localhost"
+    )
+    context = {"request": request}
+    for serializer_class, model in (
+        (PostSerializer, Post),
+        (CommentSerializer, Comment),
+    ):
+        queryset = model.objects.select_related("author").order_by("id")
+        representation = ValuesRepresentation.for_serializer(
+            serializer_class(context=context)
+        )
+
+        def serializer_path():
+            return serializer_class(
+                queryset.all(), many=True, context=context
+            ).data
+
+        def values_path():
+            return representation.represent(
+                representation.get_queryset(queryset.all())
+            )
+
+        assert serializer_path() == values_path()
+        slow = min(timeit.repeat(serializer_path, number=1,
+                                 repeat=args.repeat))
+        fast = min(timeit.repeat(values_path, number=1, repeat=args.repeat))
+        print(
+            f"{serializer_class.__name__:<18} rows={args.rows} "
+            f"serializer={slow * 1000:8.1f} ms  "
+            f"values={fast * 1000:8.1f} ms  "
+            f"speedup={slow / fast:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Django в памяти для бенчмарков: SQLite `:memory:` без миграций."""
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "yatube_api"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube_api.settings")
+
+
+class DisableMigrations(dict):
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+def setup():
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.DATABASES["default"]["NAME"] = ":memory:"
+    settings.MIGRATION_MODULES = DisableMigrations()
+    django.setup()
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def create_posts(count):
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Comment, Group, Post
+
+    User = get_user_model()
+    users = User.objects.bulk_create(
+        User(username=f"user_{index}") for index in range(100)
+    )
+    group = Group.objects.create(title="Группа", slug="group")
+    posts = Post.objects.bulk_create(
+        Post(
+            text=f"Текст поста номер {index}. " * 10,
+            author=users[index % len(users)],
+            group=group if index % 2 else None,
+            image=f"posts/{index}.jpg" if index % 3 == 0 else "",
+        )
+        for index in range(count)
+    )
+    Comment.objects.bulk_create(
+        Comment(
+            text=f"Комментарий {index}",
+            author=users[index % len(users)],
+            post=posts[index % len(posts)],
+        )
+        for index in range(count)
+    )
@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -26,6 +28,17 @@ if FILENAME not in project_dir_content:
         "Убедитесь, что у вас верная структура проекта."
     )
 
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    from api.throttling import get_counter_store
+
+    cache.clear()
+    get_counter_store().clear()
+
+
 pytest_plugins = [
     "tests.fixtures.fixture_user",
     "tests.fixtures.fixture_data",
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import user_cache_key
+from api.checks import check_shared_cache
+
+USER_QUERY = 'FROM "auth_user" WHERE "auth_user"."id" ='
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query["sql"] for query in context.captured_queries
+        if USER_QUERY in query["sql"]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedJWTAuthentication:
+
+    url = "/api/v1/groups/"
+
+    def test_user_cached(self, user_client):
+        response, queries = user_queries(user_client, self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1
+        response, queries = user_queries(user_client, self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert not queries, (
+            "Проверьте, что пользователь JWT-запроса берётся из кеша "
+            "без запроса к БД."
+        )
+
+    def test_save_invalidates(self, user_client, user):
+        user_queries(user_client, self.url)
+        user.first_name = "Новое имя"
+        user.save()
+        _, queries = user_queries(user_client, self.url)
+        assert len(queries) == 1, (
+            "Проверьте, что кеш пользователя сбрасывается при сохранении."
+        )
+
+    def test_deactivated_user(self, user_client, user):
+        user_queries(user_client, self.url)
+        user.is_active = False
+        user.save()
+        response = user_client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            "Проверьте, что деактивированный пользователь теряет доступ "
+            "сразу, несмотря на кеш."
+        )
+
+    def test_cached_fields_only(self, user_client, user):
+        user_queries(user_client, self.url)
+        entry = cache.get(user_cache_key(user.pk))
+        assert isinstance(entry, dict) and set(entry) == {
+            "pk", "is_active", "password_hash"
+        }, (
+            "Проверьте, что в кеше лежат только поля для проверок, "
+            "а не пользователь целиком."
+        )
+        assert user.password not in entry.values(), (
+            "Проверьте, что хеш пароля не попадает в кеш."
+        )
+
+    def test_cached_user_loads_fields(self, user_client, user):
+        user_queries(user_client, self.url)
+        response = user_client.post(
+            "/api/v1/posts/", {"text": "Пост из кеша"}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()["author"] == user.username, (
+            "Проверьте, что остальные поля пользователя из кеша "
+            "загружаются из БД."
+        )
+
+
+class TestSharedCacheCheck:
+
+    local_cache = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+    @pytest.mark.parametrize("debug", (False, True))
+    def test_local_cache(self, debug):
+        with override_settings(DEBUG=debug, CACHES=self.local_cache):
+            errors = check_shared_cache(None)
+        assert [error.id for error in errors] == (
+            [] if debug else ["api.E001"]
+        ), (
+            "Проверьте, что вне DEBUG локальный для процесса кеш "
+            "не проходит проверку."
+        )
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from posts.models import Comment, FeedEntry, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkCreate:
+
+    posts_bulk_url = "/api/v1/posts/bulk/"
+    comments_bulk_url = "/api/v1/posts/{post_id}/comments/bulk/"
+
+    def test_bulk_not_auth(self):
+        response = APIClient().post(
+            self.posts_bulk_url, data=[{"text": "Пост"}], format="json"
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_bulk_create_posts(self, user_client, user, group_1, another_user,
+                               follow_4):
+        data = [
+            {"text": "Пост 1"},
+            {"text": "Пост 2", "group": group_1.id},
+        ]
+        response = user_client.post(self.posts_bulk_url, data=data,
+                                    format="json")
+        assert response.status_code == HTTPStatus.CREATED, (
+            "Проверьте, что POST-запрос со списком постов к "
+            f"`{self.posts_bulk_url}` возвращает ответ со статусом 201."
+        )
+        results = response.json()
+        assert [item["text"] for item in results] == ["Пост 1", "Пост 2"]
+        assert all(item["author"] == user.username for item in results)
+        assert Post.objects.filter(author=user).count() == 2, (
+            f"Проверьте, что `{self.posts_bulk_url}` создаёт все посты."
+        )
+        assert FeedEntry.objects.filter(user=another_user).count() == 2, (
+            "Проверьте, что посты, созданные пачкой, попадают в ленты "
+            "подписчиков."
+        )
+
+    def test_bulk_invalid_item(self, user_client):
+        data = [{"text": "Пост 1"}, {}, {"text": "Пост 3"}]
+        response = user_client.post(self.posts_bulk_url, data=data,
+                                    format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == len(data) and errors[0] == {} and (
+            "text" in errors[1]
+        ), (
+            "Проверьте, что ответ с ошибкой содержит результат по каждому "
+            "элементу запроса."
+        )
+        assert not Post.objects.exists(), (
+            "Проверьте, что при ошибке в одном элементе пачка не "
+            "создаётся целиком."
+        )
+
+    def test_bulk_create_comments(self, user_client, post):
+        url = self.comments_bulk_url.format(post_id=post.id)
+        data = [{"text": f"Коммент {index}"} for index in range(3)]
+        response = user_client.post(url, data=data, format="json")
+        assert response.status_code == HTTPStatus.CREATED
+        assert [item["post"] for item in response.json()] == [post.id] * 3
+        assert Comment.objects.filter(post=post).count() == 3
+        post.refresh_from_db()
+        assert post.comment_count == 3, (
+            "Проверьте, что комментарии, созданные пачкой, учитываются "
+            "в `comment_count`."
+        )
+
+    def test_bulk_comments_missing_post(self, user_client):
+        url = self.comments_bulk_url.format(post_id=9999)
+        response = user_client.post(url, data=[{"text": "Коммент"}],
+                                    format="json")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not Comment.objects.exists()
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostResponseCache:
+
+    post_list_url = "/api/v1/posts/"
+    post_detail_url = "/api/v1/posts/{post_id}/"
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context.captured_queries)
+
+    @pytest.mark.parametrize("detail", (False, True))
+    def test_cached_until_post_changes(self, client, post, detail):
+        url = (
+            self.post_detail_url.format(post_id=post.id) if detail
+            else self.post_list_url
+        )
+        self.get(client, url)
+        _, queries = self.get(client, url)
+        assert queries == 0, (
+            f"Проверьте, что повторный анонимный GET-запрос к `{url}` "
+            "отдаётся из кэша без обращения к БД."
+        )
+
+        post.text = "Новый текст"
+        post.save()
+        data, _ = self.get(client, url)
+        item = data if detail else data[0]
+        assert item["text"] == "Новый текст", (
+            f"Проверьте, что после изменения поста ответ `{url}` "
+            "сразу становится актуальным."
+        )
+
+    def test_not_bumped_before_commit(self, client, post):
+        url = self.post_detail_url.format(post_id=post.id)
+        cached, _ = self.get(client, url)
+        with transaction.atomic():
+            post.text = "Новый текст"
+            post.save()
+            # До COMMIT другие запросы должны получать прежний ответ.
+            data, _ = self.get(client, url)
+            assert data == cached, (
+                "Проверьте, что версия кэша не повышается до фиксации "
+                "транзакции."
+            )
+        data, _ = self.get(client, url)
+        assert data["text"] == "Новый текст", (
+            "Проверьте, что после фиксации транзакции ответ сразу "
+            "становится актуальным."
+        )
+
+    def test_comment_invalidates_post(self, client, post, user):
+        url = self.post_detail_url.format(post_id=post.id)
+        self.get(client, url)
+        Comment.objects.create(author=user, post=post, text="Коммент")
+        _, queries = self.get(client, url)
+        assert queries > 0, (
+            "Проверьте, что новый комментарий сбрасывает кэш поста."
+        )
+
+    def test_auth_not_cached(self, user_client, post):
+        self.get(user_client, self.post_list_url)
+        _, queries = self.get(user_client, self.post_list_url)
+        assert queries > 0, (
+            "Проверьте, что ответы авторизованным пользователям "
+            "не кэшируются."
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    urls = (
+        "/api/v1/posts/",
+        "/api/v1/posts/{post_id}/",
+        "/api/v1/posts/{post_id}/comments/",
+        "/api/v1/groups/",
+    )
+
+    @pytest.mark.parametrize("url", urls)
+    def test_not_modified(self, client, post, comment_1_post, url):
+        url = url.format(post_id=post.id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header("ETag"), (
+            f"Проверьте, что ответ `{url}` содержит заголовок `ETag`."
+        )
+        assert response.has_header("Last-Modified"), (
+            f"Проверьте, что ответ `{url}` содержит заголовок "
+            "`Last-Modified`."
+        )
+
+        etag = response["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Проверьте, что GET-запрос к `{url}` с актуальным "
+            "`If-None-Match` возвращает ответ со статусом 304."
+        )
+
+        comment_1_post.text = "Новый текст"
+        comment_1_post.save()
+        post.group.title = "Новое название"
+        post.group.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Проверьте, что после изменения данных GET-запрос к `{url}` "
+            "со старым `If-None-Match` возвращает ответ со статусом 200."
+        )
+
+    def test_etag_not_bumped_before_commit(self, client, post,
+                                           comment_1_post):
+        url = f"/api/v1/posts/{post.id}/comments/"
+        with transaction.atomic():
+            comment_1_post.text = "Новый текст"
+            comment_1_post.save()
+            # Этот ответ мог прочитать старые строки: ETag должен быть
+            # прежним, а не версией незафиксированной записи.
+            etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что ETag меняется только после фиксации "
+            "транзакции, и ответ, полученный до неё, не считается "
+            "актуальным."
+        )
+        assert response.json()[0]["text"] == "Новый текст"
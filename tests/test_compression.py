@@ -0,0 +1,128 @@
+import gzip
+import json
+from http import HTTPStatus
+from importlib import import_module, reload
+
+import pytest
+from django.core.management import call_command
+from django.urls import clear_url_caches
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCompression:
+
+    post_list_url = "/api/v1/posts/"
+
+    @pytest.fixture
+    def posts(self, user):
+        return Post.objects.bulk_create(
+            Post(text=f"Довольно длинный текст поста {index}", author=user)
+            for index in range(50)
+        )
+
+    def test_gzip(self, client, posts):
+        plain = client.get(self.post_list_url)
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Encoding"] == "gzip", (
+            "Проверьте, что при `Accept-Encoding: gzip` большой ответ "
+            "сжимается."
+        )
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == plain.content
+
+    def test_brotli(self, client, posts):
+        brotli = pytest.importorskip("brotli")
+        plain = client.get(self.post_list_url)
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        assert response["Content-Encoding"] == "br", (
+            "Проверьте, что при поддержке клиентом brotli выбирается он."
+        )
+        assert brotli.decompress(response.content) == plain.content
+
+    def test_small_response_not_compressed(self, client, post):
+        response = client.get(
+            f"{self.post_list_url}{post.id}/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        assert not response.has_header("Content-Encoding"), (
+            "Проверьте, что ответы короче порога не сжимаются."
+        )
+
+    def test_refused_encoding(self, client, posts):
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING="gzip;q=0, br;q=0"
+        )
+        assert not response.has_header("Content-Encoding")
+
+    def test_stream(self, client, posts):
+        url = f"{self.post_list_url}?stream=1"
+        response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip", (
+            "Проверьте, что потоковый ответ тоже сжимается."
+        )
+        content = gzip.decompress(b"".join(response.streaming_content))
+        expected = client.get(self.post_list_url).json()
+        assert json.loads(content) == expected
+
+
+class TestPrecompressedStatic:
+
+    static_url = "/static/redoc.yaml"
+
+    def reload_urls(self, settings):
+        clear_url_caches()
+        reload(import_module(settings.ROOT_URLCONF))
+
+    @pytest.fixture
+    def debug_urls(self, settings):
+        settings.DEBUG = True
+        self.reload_urls(settings)
+        yield
+        settings.DEBUG = False
+        self.reload_urls(settings)
+
+    @pytest.fixture
+    def static_root(self, settings, tmp_path):
+        settings.STATIC_ROOT = tmp_path
+        (tmp_path / "redoc.yaml").write_text("openapi: 3.0.2\n" * 500)
+        (tmp_path / "small.css").write_text("body {}")
+        call_command("compressstatic")
+        return tmp_path
+
+    def test_command(self, static_root):
+        assert (static_root / "redoc.yaml.gz").exists(), (
+            "Проверьте, что `compressstatic` сохраняет сжатые копии."
+        )
+        assert not (static_root / "small.css.gz").exists(), (
+            "Проверьте, что `compressstatic` пропускает маленькие файлы."
+        )
+
+    def test_serves_precompressed(self, client, static_root, debug_urls):
+        response = client.get(self.static_url, HTTP_ACCEPT_ENCODING="gzip")
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"] == "application/yaml"
+        content = b"".join(response.streaming_content)
+        assert content == (static_root / "redoc.yaml.gz").read_bytes(), (
+            "Проверьте, что статика отдаётся из предсжатой копии."
+        )
+
+    def test_serves_original(self, client, static_root, debug_urls):
+        response = client.get(self.static_url)
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header("Content-Encoding")
+        content = b"".join(response.streaming_content)
+        assert content == (static_root / "redoc.yaml").read_bytes()
+
+    def test_not_served_without_debug(self, client, static_root):
+        response = client.get(self.static_url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            "Проверьте, что без DEBUG статику отдаёт веб-сервер, "
+            "а не Django."
+        )
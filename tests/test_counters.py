@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Post
+from posts.serializers import PostSerializer
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentCount:
+
+    post_detail_url = "/api/v1/posts/{post_id}/"
+    comments_url = "/api/v1/posts/{post_id}/comments/"
+
+    def test_comment_count_follows_api(self, user_client, post):
+        url = self.comments_url.format(post_id=post.id)
+        response = user_client.post(url, data={"text": "Коммент"})
+        assert response.status_code == HTTPStatus.CREATED
+        user_client.post(url, data={"text": "Ещё коммент"})
+
+        data = user_client.get(self.post_detail_url.format(post_id=post.id))
+        assert data.json()["comment_count"] == 2, (
+            "Проверьте, что создание комментария увеличивает поле "
+            "`comment_count` поста."
+        )
+
+        response = user_client.delete(f"{url}{response.json()['id']}/")
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        post.refresh_from_db()
+        assert post.comment_count == 1, (
+            "Проверьте, что удаление комментария уменьшает поле "
+            "`comment_count` поста."
+        )
+
+    def test_comment_count_read_only(self, user_client, post):
+        user_client.patch(
+            self.post_detail_url.format(post_id=post.id),
+            data={"comment_count": 100}
+        )
+        post.refresh_from_db()
+        assert post.comment_count == 0, (
+            "Проверьте, что поле `comment_count` доступно только для чтения."
+        )
+
+    def test_update_keeps_concurrent_count(self, user, post):
+        loaded = Post.objects.get(pk=post.pk)
+        Comment.objects.create(author=user, post=post, text="Коммент")
+        Post.objects.filter(pk=post.pk).update(comment_count=1)
+        serializer = PostSerializer(
+            loaded, data={"text": "Новый текст"}, partial=True
+        )
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        post.refresh_from_db()
+        assert post.text == "Новый текст"
+        assert post.comment_count == 1, (
+            "Проверьте, что редактирование поста не затирает "
+            "`comment_count`, изменённый параллельным запросом."
+        )
+
+    def test_recount_comments(self, post, another_post, comment_1_post,
+                              comment_2_post):
+        Post.objects.filter(pk=another_post.pk).update(comment_count=5)
+        call_command("recount_comments", batch_size=1)
+        assert dict(Post.objects.values_list("pk", "comment_count")) == {
+            post.pk: Comment.objects.filter(post=post).count(),
+            another_post.pk: 0,
+        }, (
+            "Проверьте, что команда `recount_comments` исправляет "
+            "расхождения в `comment_count`."
+        )
+
+    def test_recount_in_single_statement(self, post, comment_1_post):
+        Post.objects.filter(pk=post.pk).update(comment_count=5)
+        with CaptureQueriesContext(connection) as context:
+            call_command("recount_comments")
+        assert Post.objects.get(pk=post.pk).comment_count == 1
+        assert all(
+            query["sql"].startswith("UPDATE")
+            for query in context.captured_queries
+            if "COUNT(" in query["sql"]
+        ), (
+            "Проверьте, что `recount_comments` пересчитывает и записывает "
+            "счётчик одним UPDATE, без отдельного чтения."
+        )
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExpandComments:
+
+    posts_url = "/api/v1/posts/"
+
+    def create_comments(self, posts, count):
+        return {
+            post.id: [
+                Comment.objects.create(
+                    author=post.author, post=post, text=f"Коммент {index}"
+                ).id
+                for index in range(count)
+            ]
+            for post in posts
+        }
+
+    def test_latest_comments(self, client, post, another_post):
+        comments = self.create_comments([post, another_post], 4)
+        empty = Post.objects.create(author=post.author, text="Без ответов")
+        data = client.get(
+            f"{self.posts_url}?expand=comments&comments_limit=2"
+        ).json()
+        received = {item["id"]: item["comments"] for item in data}
+        for post_id in (post.id, another_post.id):
+            assert [
+                comment["id"] for comment in received[post_id]
+            ] == comments[post_id][:-3:-1], (
+                "Проверьте, что `?expand=comments` добавляет к посту "
+                "`comments_limit` последних комментариев, новые первыми."
+            )
+        assert received[empty.id] == []
+        assert set(received[post.id][0]) >= {"id", "text", "author"}, (
+            "Проверьте, что комментарии сериализуются `CommentSerializer`."
+        )
+
+    def test_single_query(self, client, post, another_post):
+        self.create_comments([post], 3)
+        with CaptureQueriesContext(connection) as plain:
+            client.get(f"{self.posts_url}?limit=10")
+        self.create_comments([another_post], 3)
+        with CaptureQueriesContext(connection) as expanded:
+            client.get(f"{self.posts_url}?limit=10&expand=comments")
+        assert len(expanded) == len(plain) + 1, (
+            "Проверьте, что комментарии всех постов страницы загружаются "
+            "одним запросом."
+        )
+
+    def test_without_expand(self, client, post, comment_1_post):
+        data = client.get(self.posts_url).json()
+        assert "comments" not in data[0]
+
+    def test_with_sparse_fields(self, client, post, comment_1_post):
+        data = client.get(
+            f"{self.posts_url}?expand=comments&fields=text"
+        ).json()
+        assert set(data[0]) == {"text", "comments"}
+        assert data[0]["comments"][0]["id"] == comment_1_post.id
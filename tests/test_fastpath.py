@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from posts.fastpath import ValuesRepresentation
+from posts.models import Comment, Post
+from posts.serializers import CommentSerializer, PostSerializer
+
+
+@pytest.mark.django_db(transaction=True)
+class TestValuesRepresentation:
+
+    @pytest.fixture
+    def context(self):
+        return {"request": APIRequestFactory().get("/api/v1/posts/")}
+
+    @pytest.mark.parametrize("serializer_class, model", (
+        (PostSerializer, Post),
+        (CommentSerializer, Comment),
+    ))
+    def test_parity(self, context, post, another_post, comment_1_post,
+                    comment_2_post, serializer_class, model):
+        Post.objects.filter(pk=post.pk).update(image="posts/image.jpg")
+        Post.objects.filter(pk=another_post.pk).update(
+            image="posts/other.jpg",
+            image_variants={
+                "source": "posts/other.jpg",
+                "thumb": "posts/other.thumb.webp",
+            }
+        )
+        queryset = model.objects.order_by("id")
+        expected = serializer_class(queryset, many=True, context=context).data
+
+        representation = ValuesRepresentation.for_serializer(
+            serializer_class(context=context)
+        )
+        assert representation is not None, (
+            f"Проверьте, что `{serializer_class.__name__}` поддерживается "
+            "быстрым путём сериализации."
+        )
+        received = representation.represent(
+            representation.get_queryset(queryset)
+        )
+        assert json.dumps(received) == json.dumps(expected), (
+            f"Проверьте, что быстрый путь для `{serializer_class.__name__}` "
+            "возвращает те же данные в том же порядке полей."
+        )
+
+    def test_list_endpoint_parity(self, client, post, another_post, context):
+        expected = PostSerializer(
+            Post.objects.order_by("id"), many=True, context=context
+        ).data
+        assert client.get("/api/v1/posts/").json() == expected, (
+            "Проверьте, что список постов совпадает с выводом "
+            "`PostSerializer`."
+        )
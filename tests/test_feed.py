@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import FeedEntry, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    url = "/api/v1/feed/"
+
+    def get_feed_ids(self, client, url=None):
+        ids = []
+        response = client.get(url or f"{self.url}?page_size=2")
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что GET-запрос авторизованного пользователя к "
+            f"`{self.url}` возвращает ответ со статусом 200."
+        )
+        data = response.json()
+        ids.extend(item["id"] for item in data["results"])
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            ids.extend(item["id"] for item in data["results"])
+        return ids
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            "Проверьте, что GET-запрос неавторизованного пользователя к "
+            f"`{self.url}` возвращает ответ со статусом 401."
+        )
+
+    def test_feed_fan_out_on_write(self, user_client, user, another_user,
+                                   user_2, follow_1):
+        posts = [
+            Post.objects.create(text=f"Пост {index}", author=another_user)
+            for index in range(3)
+        ]
+        Post.objects.create(text="Чужой пост", author=user_2)
+        Post.objects.create(text="Свой пост", author=user)
+        assert FeedEntry.objects.filter(user=user).count() == len(posts), (
+            "Проверьте, что новые посты раскладываются по лентам "
+            "подписчиков автора при создании."
+        )
+        assert self.get_feed_ids(user_client) == [
+            post.id for post in reversed(posts)
+        ], (
+            f"Проверьте, что `{self.url}` возвращает посты авторов из "
+            "подписок пользователя от новых к старым."
+        )
+
+    def test_feed_follow_and_unfollow(self, user_client, user, another_user):
+        post = Post.objects.create(text="Старый пост", author=another_user)
+        follow = Follow.objects.create(user=user, following=another_user)
+        assert self.get_feed_ids(user_client) == [post.id], (
+            "Проверьте, что после подписки в ленту попадают последние посты "
+            "автора."
+        )
+        follow.delete()
+        assert self.get_feed_ids(user_client) == [], (
+            "Проверьте, что после отписки посты автора пропадают из ленты."
+        )
+
+    def test_feed_fan_out_on_read(self, monkeypatch, user_client, user,
+                                  another_user, follow_1):
+        monkeypatch.setattr("posts.feed.FEED_FANOUT_LIMIT", 1)
+        posts = [
+            Post.objects.create(text=f"Пост {index}", author=another_user)
+            for index in range(3)
+        ]
+        assert not FeedEntry.objects.exists(), (
+            "Проверьте, что посты популярных авторов не раскладываются "
+            "по лентам при создании."
+        )
+        assert self.get_feed_ids(user_client) == [
+            post.id for post in reversed(posts)
+        ], (
+            "Проверьте, что посты популярных авторов попадают в ленту "
+            "при чтении."
+        )
+
+    def test_feed_after_threshold_goes_down(self, monkeypatch, user_client,
+                                            user, another_user, user_2,
+                                            follow_1):
+        monkeypatch.setattr("posts.feed.FEED_FANOUT_LIMIT", 2)
+        fan = Follow.objects.create(user=user_2, following=another_user)
+        pulled = Post.objects.create(text="Пост", author=another_user)
+        fan.delete()
+        pushed = Post.objects.create(text="Новый пост", author=another_user)
+        assert self.get_feed_ids(user_client) == [pushed.id, pulled.id], (
+            "Проверьте, что посты, опубликованные при большом числе "
+            "подписчиков, не пропадают из ленты, когда подписчиков "
+            "становится меньше порога."
+        )
+
+    def test_feed_after_threshold_goes_up(self, monkeypatch, user_client,
+                                          user, another_user, user_2):
+        monkeypatch.setattr("posts.feed.FEED_FANOUT_LIMIT", 2)
+        pushed = Post.objects.create(text="Пост", author=another_user)
+        Follow.objects.create(user=user_2, following=another_user)
+        Follow.objects.create(user=user, following=another_user)
+        pulled = Post.objects.create(text="Новый пост", author=another_user)
+        assert self.get_feed_ids(user_client) == [pulled.id, pushed.id], (
+            "Проверьте, что новый подписчик популярного автора видит "
+            "и его старые посты, и новые."
+        )
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSparseFieldsets:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), " ".join(
+            query["sql"] for query in context.captured_queries
+        )
+
+    @pytest.mark.parametrize("url", (
+        "/api/v1/posts/?fields=id,author,pub_date",
+        "/api/v1/posts/?exclude=text,image,image_variants,group,comment_count",
+        "/api/v1/posts/?cursor=&fields=id,author,pub_date",
+        "/api/v1/posts/{post_id}/?fields=id,author,pub_date",
+    ))
+    def test_post_fields(self, client, post, url):
+        data, sql = self.get(client, url.format(post_id=post.id))
+        if isinstance(data, dict) and "results" in data:
+            data = data["results"]
+        item = data if isinstance(data, dict) else data[0]
+        assert set(item) == {"id", "author", "pub_date"}, (
+            f"Проверьте, что `{url}` возвращает только запрошенные поля."
+        )
+        assert item["author"] == post.author.username
+        assert '"posts_post"."text"' not in sql, (
+            f"Проверьте, что для `{url}` поле `text` не читается из БД."
+        )
+
+    def test_comment_fields(self, client, post, comment_1_post):
+        url = f"/api/v1/posts/{post.id}/comments/?fields=id,text"
+        data, sql = self.get(client, url)
+        assert data == [{"id": comment_1_post.id, "text": comment_1_post.text}]
+        assert '"auth_user"' not in sql, (
+            "Проверьте, что связи, которых нет в ответе, не подгружаются."
+        )
+
+    def test_group_fields(self, client, group_1):
+        data, sql = self.get(client, "/api/v1/groups/?exclude=description")
+        assert data == [
+            {"id": group_1.id, "title": group_1.title, "slug": group_1.slug}
+        ]
+        assert '"posts_group"."description"' not in sql
+
+    def test_write_ignores_fields(self, user_client):
+        response = user_client.post(
+            "/api/v1/posts/?fields=id", data={"text": "Новый пост"}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert "text" in response.json(), (
+            "Проверьте, что параметр `fields` не влияет на ответы "
+            "на запросы записи."
+        )
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Follow
+from posts.serializers import FollowCreateSerializer, FollowSerializer
+from posts.views import FollowViewSet
+
+
+def count_statements(context):
+    """Запросы без управления транзакциями (BEGIN, SAVEPOINT)."""
+    return len([
+        query for query in context.captured_queries
+        if query["sql"].split()[0] in ("SELECT", "INSERT", "UPDATE", "DELETE")
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowCreate:
+
+    url = "/api/v1/follow/"
+
+    def legacy_errors(self, user, data):
+        serializer = FollowSerializer(
+            data=data, context={"request": SimpleNamespace(user=user)}
+        )
+        assert not serializer.is_valid()
+        return serializer.errors
+
+    @pytest.mark.parametrize("following", (
+        "another", "self", "nobody", "", " ", None, ["a"], {"a": 1}, 5, True
+    ))
+    def test_same_errors(self, user_client, user, another_user, follow_1,
+                         following):
+        if following == "another":
+            following = another_user.username
+        elif following == "self":
+            following = user.username
+        data = {"following": following}
+        expected = self.legacy_errors(user, data)
+        response = user_client.post(self.url, data, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == expected, (
+            "Проверьте, что ошибки создания подписки совпадают с ошибками "
+            "`FollowSerializer`."
+        )
+
+    def test_author_deleted_before_insert(self, monkeypatch, user_client,
+                                          user, another_user):
+        data = {"following": another_user.username}
+        expected = self.legacy_errors(user, {"following": "nobody"})
+
+        # Автора удалил другой запрос уже после поиска.
+        type(user).objects.filter(pk=another_user.pk).delete()
+        monkeypatch.setattr(
+            FollowCreateSerializer, "get_following",
+            lambda self, username: another_user
+        )
+
+        def create(**kwargs):
+            raise IntegrityError("FOREIGN KEY constraint failed")
+
+        monkeypatch.setattr(Follow.objects, "create", create)
+        response = user_client.post(self.url, data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()["following"] == [
+            expected["following"][0].replace("nobody", data["following"])
+        ], (
+            "Проверьте, что ошибка внешнего ключа не выдаётся за "
+            "повторную подписку."
+        )
+
+    def test_fewer_queries(self, monkeypatch, django_user_model,
+                           user_client, user, another_user, user_2):
+        # Первая подписка заполняет кеш пользователя и его счётчики.
+        warm_up = django_user_model.objects.create_user(username="warm")
+        user_client.post(self.url, {"following": warm_up.username})
+        with CaptureQueriesContext(connection) as direct:
+            response = user_client.post(
+                self.url, {"following": another_user.username}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()["following"] == another_user.username
+        monkeypatch.setattr(
+            FollowViewSet, "get_serializer_class",
+            lambda self: FollowSerializer
+        )
+        with CaptureQueriesContext(connection) as validated:
+            response = user_client.post(
+                self.url, {"following": user_2.username}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_statements(direct) < count_statements(validated), (
+            "Проверьте, что подписка создаётся без проверочных запросов "
+            "перед INSERT."
+        )
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from posts import images
+from posts.constants import IMAGE_VARIANTS
+from posts.models import Post
+
+
+def make_image(size=(1600, 1200), name="photo.png"):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImageVariants:
+
+    post_list_url = "/api/v1/posts/"
+
+    @pytest.fixture
+    def executor(self, settings, tmp_path, monkeypatch):
+        settings.MEDIA_ROOT = tmp_path
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(images, "get_executor", lambda: executor)
+        yield executor
+        executor.shutdown(wait=True)
+
+    def test_variants_built_in_background(self, user_client, executor):
+        response = user_client.post(
+            self.post_list_url,
+            {"text": "Пост с картинкой", "image": make_image()},
+            format="multipart"
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        image_url = response.json()["image"]
+        assert response.json()["image_variants"] == {
+            variant: image_url for variant in IMAGE_VARIANTS
+        }, (
+            "Проверьте, что пока варианты не готовы, `image_variants` "
+            "ссылается на оригинал."
+        )
+
+        executor.shutdown(wait=True)
+        post = Post.objects.get(pk=response.json()["id"])
+        assert images.variants_ready(post), (
+            "Проверьте, что варианты изображения строятся после загрузки."
+        )
+        data = user_client.get(f"{self.post_list_url}{post.id}/").json()
+        for variant, (width, height) in IMAGE_VARIANTS.items():
+            assert data["image_variants"][variant].endswith(".webp")
+            with Image.open(
+                images.get_storage().open(post.image_variants[variant])
+            ) as image:
+                assert image.format == "WEBP"
+                assert image.width <= width and image.height <= height
+
+    def test_stale_variants_ignored(self, client, user, executor):
+        post = Post.objects.create(
+            text="Пост", author=user, image=make_image(name="first.png")
+        )
+        executor.shutdown(wait=True)
+        first = post.image.name
+        Post.objects.filter(pk=post.pk).update(image="posts/second.png")
+
+        images.build_variants(post.pk, first)
+        data = client.get(f"{self.post_list_url}{post.id}/").json()
+        assert set(data["image_variants"].values()) == {data["image"]}, (
+            "Проверьте, что варианты прежнего файла не отдаются для "
+            "нового изображения."
+        )
+
+    def test_without_image(self, client, post):
+        data = client.get(f"{self.post_list_url}{post.id}/").json()
+        assert data["image_variants"] is None
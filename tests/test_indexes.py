@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Follow, Post
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return " | ".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def main_query(client, url, table):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    for query in context.captured_queries:
+        sql = query["sql"]
+        if sql.startswith("SELECT") and f'FROM "{table}"' in sql:
+            return sql
+    raise AssertionError(f"Запрос к таблице `{table}` для `{url}` не найден.")
+
+
+def assert_uses_index(plan, table, description):
+    assert "USING" in plan and "INDEX" in plan, (
+        f"Проверьте, что {description} использует индекс. План: {plan}"
+    )
+    assert f"SCAN {table}" not in plan.replace(
+        f"SCAN {table} USING", ""
+    ), f"Проверьте, что {description} не сканирует `{table}` целиком."
+    assert "TEMP B-TREE" not in plan, (
+        f"Проверьте, что {description} не сортирует строки во временном "
+        f"B-дереве. План: {plan}"
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="План проверяется для SQLite."
+)
+@pytest.mark.django_db(transaction=True)
+class TestQueryPlans:
+
+    @pytest.mark.parametrize("url, table", (
+        ("/api/v1/posts/?cursor=", "posts_post"),
+        ("/api/v1/posts/?cursor=&group={group_id}", "posts_post"),
+        ("/api/v1/posts/{post_id}/comments/", "posts_comment"),
+    ))
+    def test_endpoint_query_uses_index(self, client, post, comment_1_post,
+                                       url, table):
+        url = url.format(post_id=post.id, group_id=post.group_id)
+        plan = explain(main_query(client, url, table))
+        assert_uses_index(plan, table, f"основной запрос `{url}`")
+
+    def test_follow_list_uses_index(self, user_client, follow_1):
+        plan = explain(main_query(user_client, "/api/v1/follow/", "posts_follow"))
+        assert_uses_index(plan, "posts_follow", "список подписок")
+
+    def test_posts_by_author_uses_index(self, user, post):
+        queryset = Post.objects.filter(author=user).order_by("-pub_date", "-id")
+        assert_uses_index(
+            explain(str(queryset.query)), "posts_post", "выборка постов автора"
+        )
+
+    def test_comments_by_post_uses_index(self, post):
+        queryset = Comment.objects.filter(post=post).order_by("created", "id")
+        assert_uses_index(
+            explain(str(queryset.query)), "posts_comment",
+            "выборка комментариев поста"
+        )
+
+    def test_followers_use_index(self, user, follow_2):
+        queryset = Follow.objects.filter(following=user).values("user_id")
+        assert_uses_index(
+            explain(str(queryset.query)), "posts_follow",
+            "выборка подписчиков"
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostCursorPagination:
+
+    post_list_url = "/api/v1/posts/"
+
+    @pytest.fixture
+    def posts(self, user):
+        return [
+            Post.objects.create(text=f"Пост {index}", author=user)
+            for index in range(5)
+        ]
+
+    def test_cursor_pages(self, client, posts):
+        response = client.get(f"{self.post_list_url}?cursor=&page_size=2")
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что GET-запрос с параметром `cursor` к "
+            f"`{self.post_list_url}` возвращает ответ со статусом 200."
+        )
+        data = response.json()
+        assert set(data) == {"next", "previous", "results"}, (
+            "Проверьте, что ответ с курсорной пагинацией содержит только "
+            "поля `next`, `previous` и `results` — без общего количества."
+        )
+        assert data["previous"] is None
+
+        expected_ids = [post.id for post in reversed(posts)]
+        received_ids = [item["id"] for item in data["results"]]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            received_ids.extend(item["id"] for item in data["results"])
+        assert received_ids == expected_ids, (
+            "Проверьте, что переход по ссылкам `next` возвращает все посты "
+            "от новых к старым без пропусков и повторов."
+        )
+
+        previous_page = client.get(data["previous"]).json()
+        assert [item["id"] for item in previous_page["results"]] == (
+            expected_ids[2:4]
+        ), (
+            "Проверьте, что ссылка `previous` возвращает предыдущую страницу."
+        )
+
+    def test_invalid_cursor(self, client, posts):
+        response = client.get(f"{self.post_list_url}?cursor=broken")
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            "Проверьте, что некорректный курсор возвращает ответ со "
+            "статусом 404."
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentCursorPagination:
+
+    comments_url = "/api/v1/posts/{post_id}/comments/"
+
+    def test_cursor_pages(self, client, post):
+        comments = [
+            Comment.objects.create(
+                author=post.author, post=post, text=f"Коммент {index}"
+            )
+            for index in range(5)
+        ]
+        url = self.comments_url.format(post_id=post.id)
+        data = client.get(f"{url}?cursor=&page_size=2").json()
+        assert set(data) == {"next", "previous", "results"}, (
+            "Проверьте, что комментарии поддерживают курсорную пагинацию "
+            "по параметру `cursor`."
+        )
+        received_ids = [item["id"] for item in data["results"]]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            received_ids.extend(item["id"] for item in data["results"])
+        assert received_ids == [comment.id for comment in comments], (
+            "Проверьте, что страницы комментариев идут от старых к новым "
+            "без пропусков и повторов."
+        )
+
+    def test_plain_list_without_cursor(self, client, post, comment_1_post):
+        url = self.comments_url.format(post_id=post.id)
+        assert isinstance(client.get(url).json(), list)
+
+    def test_missing_post(self, client, user_client, post):
+        url = self.comments_url.format(post_id=post.id + 100)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            "Проверьте, что комментарии несуществующего поста возвращают "
+            "ответ со статусом 404."
+        )
+        response = user_client.post(url, {"text": "Коммент"})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            "Проверьте, что комментарий к несуществующему посту не "
+            "создаётся и возвращается ответ со статусом 404."
+        )
+        assert not Comment.objects.exists()
+
+    def test_empty_list(self, client, post):
+        url = self.comments_url.format(post_id=post.id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == []
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Follow, Post
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestListQueries:
+
+    post_list_url = "/api/v1/posts/"
+    comments_url = "/api/v1/posts/{post_id}/comments/"
+    follow_url = "/api/v1/follow/"
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create_user(
+                username=f"author_{index}", password="1234567"
+            )
+            for index in range(4)
+        ]
+
+    def test_post_list_queries(self, client, user, authors):
+        Post.objects.create(text="Первый пост", author=user)
+        expected = count_queries(client, self.post_list_url)
+        for author in authors:
+            Post.objects.create(text="Ещё пост", author=author)
+        assert count_queries(client, self.post_list_url) == expected, (
+            f"Проверьте, что число запросов к БД для `{self.post_list_url}` "
+            "не зависит от количества постов."
+        )
+
+    def test_comment_list_queries(self, client, post, authors):
+        url = self.comments_url.format(post_id=post.id)
+        Comment.objects.create(author=post.author, post=post, text="Коммент")
+        expected = count_queries(client, url)
+        for author in authors:
+            Comment.objects.create(author=author, post=post, text="Коммент")
+        assert count_queries(client, url) == expected, (
+            f"Проверьте, что число запросов к БД для `{self.comments_url}` "
+            "не зависит от количества комментариев."
+        )
+
+    def test_follow_list_queries(self, user_client, user, authors):
+        Follow.objects.create(user=user, following=authors[0])
+        # Первый запрос кладёт пользователя JWT в кеш.
+        count_queries(user_client, self.follow_url)
+        expected = count_queries(user_client, self.follow_url)
+        for author in authors[1:]:
+            Follow.objects.create(user=user, following=author)
+        assert count_queries(user_client, self.follow_url) == expected, (
+            f"Проверьте, что число запросов к БД для `{self.follow_url}` "
+            "не зависит от количества подписок."
+        )
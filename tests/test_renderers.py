@@ -0,0 +1,35 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+msgpack = pytest.importorskip("msgpack")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRenderers:
+
+    post_list_url = "/api/v1/posts/"
+
+    def test_json_matches_drf(self, client, post, post_2):
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == JSONRenderer().render(response.data), (
+            "Проверьте, что быстрый JSON-рендерер отдаёт те же байты, что и "
+            "стандартный `JSONRenderer`."
+        )
+
+    def test_msgpack(self, client, post, post_2):
+        expected = client.get(self.post_list_url).json()
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT="application/msgpack"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/msgpack", (
+            "Проверьте, что при `Accept: application/msgpack` ответ "
+            "отдаётся в MessagePack."
+        )
+        assert msgpack.unpackb(response.content) == expected, (
+            "Проверьте, что ответ в MessagePack содержит те же данные, "
+            "что и JSON."
+        )
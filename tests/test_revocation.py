@@ -0,0 +1,92 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import RevokedToken
+from api.revocation import RevocationSet
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenRevocation:
+
+    revoke_url = "/api/v1/jwt/revoke/"
+    refresh_url = "/api/v1/jwt/refresh/"
+    verify_url = "/api/v1/jwt/verify/"
+    url = "/api/v1/groups/"
+
+    def test_revoke(self, user_client, token):
+        response = user_client.post(
+            self.revoke_url, {"refresh": token["refresh"]}, format="json"
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            f"Проверьте, что POST-запрос к `{self.revoke_url}` возвращает "
+            "ответ со статусом 204."
+        )
+        assert user_client.get(self.url).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), "Проверьте, что отозванный access-токен больше не принимается."
+
+        client = APIClient()
+        response = client.post(
+            self.refresh_url, {"refresh": token["refresh"]}, format="json"
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            "Проверьте, что отозванный refresh-токен нельзя обменять "
+            "на новый access-токен."
+        )
+        response = client.post(
+            self.verify_url, {"token": token["access"]}, format="json"
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_foreign_refresh(self, user_client, user_2):
+        refresh = RefreshToken.for_user(user_2)
+        response = user_client.post(
+            self.revoke_url, {"refresh": str(refresh)}, format="json"
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что нельзя отозвать токен другого пользователя."
+        )
+
+    def test_valid_token_without_lookup(self, user_client):
+        user_client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in context.captured_queries
+            if "api_revokedtoken" in query["sql"]
+        ], (
+            "Проверьте, что проверка действующего токена не обращается "
+            "к таблице отозванных токенов."
+        )
+
+    def test_sync_from_database(self):
+        revoked = RevocationSet()
+        assert not revoked.is_revoked("jti-1")
+        RevokedToken.objects.create(
+            jti="jti-1", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        revoked.synced_at = None
+        assert revoked.is_revoked("jti-1"), (
+            "Проверьте, что отзывы из БД подгружаются при синхронизации."
+        )
+
+    def test_sync_out_of_pk_order(self):
+        expires_at = timezone.now() + timedelta(hours=1)
+        RevokedToken.objects.create(pk=100, jti="late", expires_at=expires_at)
+        revoked = RevocationSet()
+        assert revoked.is_revoked("late")
+        # Транзакция с меньшим pk закоммичена позже.
+        RevokedToken.objects.create(pk=5, jti="early", expires_at=expires_at)
+        revoked.synced_at = None
+        assert revoked.is_revoked("early"), (
+            "Проверьте, что синхронизация не пропускает отзывы, "
+            "закоммиченные не в порядке первичного ключа."
+        )
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostSearch:
+
+    post_list_url = "/api/v1/posts/"
+
+    def search(self, client, term):
+        response = client.get(self.post_list_url, {"search": term})
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что GET-запрос с параметром `search` к "
+            f"`{self.post_list_url}` возвращает ответ со статусом 200."
+        )
+        return [item["id"] for item in response.json()]
+
+    def test_search_index_installed(self):
+        assert "posts_post_fts" in connection.introspection.table_names(), (
+            "Проверьте, что после миграций создаётся полнотекстовый индекс "
+            "постов."
+        )
+
+    def test_search_ranking(self, client, user):
+        weak = Post.objects.create(
+            text="Про котов и немного про погоду, город, море, лес и горы",
+            author=user
+        )
+        strong = Post.objects.create(text="Коты, коты и снова коты", author=user)
+        Post.objects.create(text="Собаки", author=user)
+        assert self.search(client, "кот") == [strong.id, weak.id], (
+            "Проверьте, что поиск находит посты по префиксу слова без учёта "
+            "регистра и сортирует их по релевантности."
+        )
+
+    def test_search_index_in_sync(self, client, user):
+        post = Post.objects.create(text="Старый текст", author=user)
+        post.text = "Новый текст"
+        post.save()
+        assert self.search(client, "старый") == []
+        assert self.search(client, "новый") == [post.id]
+        post.delete()
+        assert self.search(client, "новый") == [], (
+            "Проверьте, что индекс обновляется при изменении и удалении "
+            "постов."
+        )
@@ -0,0 +1,132 @@
+import re
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from posts.models import Post, StoredFile
+from posts.storage import ContentAddressedStorage, content_storage
+
+CONTENT_NAME = re.compile(
+    r"^posts/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.png$"
+)
+
+
+def make_png(color="green"):
+    buffer = BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def test_content_addressed_names(media_root):
+    first = content_storage.save("posts/a.PNG", ContentFile(make_png()))
+    second = content_storage.save("posts/b.png", ContentFile(make_png()))
+    assert CONTENT_NAME.match(first), (
+        "Проверьте, что файл называется по хешу содержимого и лежит "
+        "во вложенных каталогах по первым символам хеша."
+    )
+    assert first == second, (
+        "Проверьте, что одинаковое содержимое сохраняется под одним именем."
+    )
+    assert len([path for path in media_root.rglob("*") if path.is_file()]) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImageReferences:
+
+    post_list_url = "/api/v1/posts/"
+
+    @pytest.fixture(autouse=True)
+    def no_variants(self, monkeypatch):
+        monkeypatch.setattr(
+            "posts.signals.schedule_variants", lambda post: None
+        )
+
+    def create_post(self, client, content):
+        response = client.post(
+            self.post_list_url,
+            {
+                "text": "Пост",
+                "image": SimpleUploadedFile("photo.png", content),
+            },
+            format="multipart"
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        return Post.objects.get(pk=response.json()["id"])
+
+    def test_dedupe_and_cleanup(self, user_client, media_root):
+        first = self.create_post(user_client, make_png())
+        second = self.create_post(user_client, make_png())
+        assert first.image.name == second.image.name, (
+            "Проверьте, что одинаковые изображения хранятся одним файлом."
+        )
+        path = media_root / first.image.name
+        assert StoredFile.objects.get(name=first.image.name).refcount == 2
+
+        user_client.delete(f"{self.post_list_url}{first.id}/")
+        assert path.exists(), (
+            "Проверьте, что файл не удаляется, пока на него ссылаются посты."
+        )
+        user_client.delete(f"{self.post_list_url}{second.id}/")
+        assert not path.exists(), (
+            "Проверьте, что файл удаляется вместе с последним постом."
+        )
+        assert not StoredFile.objects.exists()
+
+    def test_reupload_during_cleanup(self, monkeypatch, user_client,
+                                     media_root):
+        first = self.create_post(user_client, make_png())
+        path = media_root / first.image.name
+        original_save = ContentAddressedStorage.save
+
+        def save(storage, name, content, max_length=None):
+            name = original_save(storage, name, content, max_length)
+            # Последний пост со старой копией удаляется, когда новая
+            # загрузка уже решила не записывать файл.
+            if Post.objects.filter(pk=first.pk).exists():
+                user_client.delete(f"{self.post_list_url}{first.id}/")
+            return name
+
+        monkeypatch.setattr(ContentAddressedStorage, "save", save)
+        second = self.create_post(user_client, make_png())
+        assert second.image.name == path.relative_to(media_root).as_posix()
+        assert path.exists(), (
+            "Проверьте, что удаление файла без ссылок не оставляет "
+            "повторную загрузку того же содержимого без файла."
+        )
+        assert StoredFile.objects.get(name=second.image.name).refcount == 1
+
+    def test_replace_image(self, user_client, media_root):
+        post = self.create_post(user_client, make_png())
+        old_path = media_root / post.image.name
+        response = user_client.patch(
+            f"{self.post_list_url}{post.id}/",
+            {"image": SimpleUploadedFile("new.png", make_png("white"))},
+            format="multipart"
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert not old_path.exists(), (
+            "Проверьте, что прежний файл удаляется при замене изображения."
+        )
+        assert list(StoredFile.objects.values_list("name", "refcount")) == [
+            (post.image.name, 1)
+        ]
+
+    def test_text_edit_keeps_reference(self, user_client, media_root):
+        post = self.create_post(user_client, make_png())
+        user_client.patch(
+            f"{self.post_list_url}{post.id}/", {"text": "Новый текст"},
+            format="json"
+        )
+        assert StoredFile.objects.get(name=post.image.name).refcount == 1
+        assert (media_root / post.image.name).exists()
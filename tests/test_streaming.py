@@ -0,0 +1,27 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostStreaming:
+
+    post_list_url = "/api/v1/posts/"
+
+    def test_stream_matches_list(self, client, post, post_2, another_post):
+        response = client.get(f"{self.post_list_url}?stream=1")
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            "Проверьте, что GET-запрос с параметром `stream=1` к "
+            f"`{self.post_list_url}` возвращает потоковый ответ."
+        )
+        streamed = json.loads(b"".join(response.streaming_content))
+        assert streamed == client.get(self.post_list_url).json(), (
+            "Проверьте, что потоковый ответ содержит те же посты, что и "
+            "обычный список."
+        )
+
+    def test_stream_empty(self, client):
+        response = client.get(f"{self.post_list_url}?stream=1")
+        assert json.loads(b"".join(response.streaming_content)) == []
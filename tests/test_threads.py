@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.constants import COMMENT_MAX_DEPTH
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentThreads:
+
+    comments_url = "/api/v1/posts/{post_id}/comments/"
+
+    def reply(self, client, post, parent=None, text="Ответ"):
+        data = {"text": text}
+        if parent is not None:
+            data["parent"] = parent
+        response = client.post(
+            self.comments_url.format(post_id=post.id), data
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        return response.json()["id"]
+
+    def build_thread(self, client, post):
+        first = self.reply(client, post)
+        child = self.reply(client, post, first)
+        grandchild = self.reply(client, post, child)
+        second = self.reply(client, post)
+        return first, child, grandchild, second
+
+    def test_reply_fields(self, user_client, post):
+        first, child, _, _ = self.build_thread(user_client, post)
+        url = self.comments_url.format(post_id=post.id)
+        data = user_client.get(f"{url}{child}/").json()
+        assert data["parent"] == first and data["depth"] == 1, (
+            "Проверьте, что ответ содержит `parent` и уровень вложенности "
+            "`depth`."
+        )
+
+    def test_nested_tree(self, client, user_client, post):
+        first, child, grandchild, second = self.build_thread(
+            user_client, post
+        )
+        url = self.comments_url.format(post_id=post.id)
+        with CaptureQueriesContext(connection) as queries:
+            tree = client.get(f"{url}tree/").json()
+        assert len(queries) == 1, (
+            "Проверьте, что дерево комментариев загружается одним запросом."
+        )
+        assert [node["id"] for node in tree] == [first, second]
+        assert tree[0]["replies"][0]["id"] == child
+        assert tree[0]["replies"][0]["replies"][0]["id"] == grandchild, (
+            "Проверьте, что ответы вложены в `replies` родителя."
+        )
+
+    def test_flat_subtree(self, client, user_client, post):
+        first, child, grandchild, _ = self.build_thread(user_client, post)
+        url = self.comments_url.format(post_id=post.id)
+        response = client.get(f"{url}{first}/tree/?flat=1")
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            (item["id"], item["depth"]) for item in response.json()
+        ] == [(first, 0), (child, 1), (grandchild, 2)], (
+            "Проверьте, что поддерево отдаётся плоским списком в порядке "
+            "обхода."
+        )
+        response = client.get(f"{url}{first}/tree/?depth=1")
+        assert response.json()[0]["replies"][0]["replies"] == [], (
+            "Проверьте, что параметр `depth` ограничивает вложенность."
+        )
+        response = client.get(f"{url}{first + 100}/tree/")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_tree_limit(self, client, user_client, post):
+        self.build_thread(user_client, post)
+        url = self.comments_url.format(post_id=post.id)
+        data = client.get(f"{url}tree/?flat=1&limit=2").json()
+        assert len(data) == 2, (
+            "Проверьте, что параметр `limit` ограничивает число "
+            "комментариев в дереве."
+        )
+
+    def test_reply_validation(self, user_client, post, another_post,
+                              comment_1_another_post):
+        url = self.comments_url.format(post_id=post.id)
+        response = user_client.post(
+            url, {"text": "Ответ", "parent": comment_1_another_post.id}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что нельзя ответить на комментарий к другому посту."
+        )
+        parent = None
+        for _ in range(COMMENT_MAX_DEPTH + 1):
+            parent = self.reply(user_client, post, parent)
+        response = user_client.post(url, {"text": "Ответ", "parent": parent})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что глубина вложенности ответов ограничена."
+        )
+
+    def test_bulk_replies(self, client, user_client, post):
+        first = self.reply(user_client, post)
+        url = self.comments_url.format(post_id=post.id)
+        response = user_client.post(
+            f"{url}bulk/",
+            [{"text": "Ответ"}, {"text": "Ответ", "parent": first}],
+            format="json"
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        _, reply = response.json()
+        assert reply["depth"] == 1
+        tree = client.get(f"{url}tree/").json()
+        assert tree[0]["replies"][0]["id"] == reply["id"], (
+            "Проверьте, что комментарии, созданные пачкой, получают путь "
+            "в дереве."
+        )
+
+    def test_delete_branch(self, user_client, post):
+        first, _, _, _ = self.build_thread(user_client, post)
+        url = self.comments_url.format(post_id=post.id)
+        user_client.delete(f"{url}{first}/")
+        assert Comment.objects.filter(post=post).count() == 1
+        assert Post.objects.get(pk=post.pk).comment_count == 1, (
+            "Проверьте, что при удалении ветки счётчик комментариев "
+            "уменьшается на число удалённых ответов."
+        )
+
+    def test_delete_branch_with_drifted_count(self, user_client, post):
+        first, _, _, _ = self.build_thread(user_client, post)
+        Post.objects.filter(pk=post.pk).update(comment_count=2)
+        url = self.comments_url.format(post_id=post.id)
+        user_client.delete(f"{url}{first}/")
+        assert Post.objects.get(pk=post.pk).comment_count == 0, (
+            "Проверьте, что счётчик комментариев не уходит ниже нуля и "
+            "уменьшается, даже если он меньше размера ветки."
+        )
@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.throttling import (
+    AnonReadThrottle,
+    JWTCreateThrottle,
+    SQLiteCounterStore,
+    UserWriteThrottle,
+    get_counter_store
+)
+
+
+def set_rate(monkeypatch, throttle_class, rate):
+    monkeypatch.setitem(
+        throttle_class.THROTTLE_RATES, throttle_class.scope, rate
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestThrottling:
+
+    post_list_url = "/api/v1/posts/"
+    jwt_create_url = "/api/v1/jwt/create/"
+
+    def test_anon_read(self, client, user_client, monkeypatch):
+        set_rate(monkeypatch, AnonReadThrottle, "3/min")
+        for _ in range(3):
+            assert client.get(self.post_list_url).status_code == HTTPStatus.OK
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            "Проверьте, что анонимные запросы сверх лимита получают "
+            "ответ со статусом 429."
+        )
+        assert int(response["Retry-After"]) > 0
+        assert user_client.get(self.post_list_url).status_code == (
+            HTTPStatus.OK
+        ), (
+            "Проверьте, что лимит по IP не затрагивает "
+            "аутентифицированных пользователей."
+        )
+
+    def test_user_write(self, user_client, monkeypatch):
+        set_rate(monkeypatch, UserWriteThrottle, "1/min")
+        data = {"text": "Пост"}
+        response = user_client.post(self.post_list_url, data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(self.post_list_url, data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            "Проверьте, что запись сверх лимита пользователя отклоняется."
+        )
+        assert user_client.get(self.post_list_url).status_code == (
+            HTTPStatus.OK
+        ), "Проверьте, что лимиты чтения и записи считаются отдельно."
+
+    def test_jwt_create(self, user, monkeypatch):
+        set_rate(monkeypatch, JWTCreateThrottle, "2/min")
+        client = APIClient()
+        data = {"username": user.username, "password": "wrong"}
+        for _ in range(2):
+            response = client.post(self.jwt_create_url, data)
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = client.post(self.jwt_create_url, data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f"Проверьте, что попытки получить токен через "
+            f"`{self.jwt_create_url}` ограничены по IP."
+        )
+
+
+def test_sliding_window(monkeypatch):
+    set_rate(monkeypatch, AnonReadThrottle, "4/min")
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+    request.user = AnonymousUser()
+    now = [600 + 10]
+    monkeypatch.setattr(AnonReadThrottle, "timer", lambda self: now[0])
+
+    def allowed():
+        return AnonReadThrottle().allow_request(request, None)
+
+    assert [allowed() for _ in range(5)] == [True] * 4 + [False]
+    # Середина следующего окна: прошлые 4 запроса весят вдвое меньше.
+    now[0] = 600 + 60 + 30
+    assert [allowed() for _ in range(3)] == [True, True, False], (
+        "Проверьте, что запросы прошлого окна учитываются с весом "
+        "оставшейся доли окна."
+    )
+
+
+def test_concurrent_at_limit(monkeypatch):
+    set_rate(monkeypatch, AnonReadThrottle, "2/min")
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+    request.user = AnonymousUser()
+    monkeypatch.setattr(AnonReadThrottle, "timer", lambda self: 600 + 10)
+
+    def allowed():
+        return AnonReadThrottle().allow_request(request, None)
+
+    assert allowed()
+    store_class = type(get_counter_store())
+    get_many = store_class.get_many
+    racing = [True]
+    results = []
+
+    def racing_get_many(self, keys):
+        counts = get_many(self, keys)
+        if racing:
+            # Другой процесс проходит проверку, пока этот не записал
+            # свой запрос.
+            racing.pop()
+            results.append(allowed())
+        return counts
+
+    monkeypatch.setattr(store_class, "get_many", racing_get_many)
+    results.append(allowed())
+    assert results == [True, False], (
+        "Проверьте, что параллельные запросы не проходят сверх лимита: "
+        "счётчик нужно увеличивать до сравнения с лимитом."
+    )
+
+
+def test_sqlite_store_shared(tmp_path):
+    path = tmp_path / "counters.sqlite3"
+    first, second = SQLiteCounterStore(path), SQLiteCounterStore(path)
+    first.incr("key", timeout=60)
+    assert second.incr("key", timeout=60) == 2, (
+        "Проверьте, что счётчики в SQLite общие для разных экземпляров "
+        "хранилища."
+    )
+    assert first.get_many(["key", "missing"]) == {"key": 2}
+    first.decr("key")
+    assert second.get_many(["key"]) == {"key": 1}
+    assert first.execute("PRAGMA synchronous").fetchone() == (1,), (
+        "Проверьте, что хранилище не делает fsync на каждый запрос "
+        "(`synchronous=NORMAL`)."
+    )
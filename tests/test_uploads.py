@@ -0,0 +1,77 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from posts import uploads
+from posts.models import Post
+
+
+def make_png(size=(200, 100)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "blue").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImageUploads:
+
+    post_list_url = "/api/v1/posts/"
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        return tmp_path
+
+    def upload(self, client, content, name="photo.png"):
+        return client.post(
+            self.post_list_url,
+            {
+                "text": "Пост с картинкой",
+                "image": SimpleUploadedFile(name, content, "image/png"),
+            },
+            format="multipart"
+        )
+
+    def test_upload(self, user_client, media_root):
+        response = self.upload(user_client, make_png())
+        assert response.status_code == HTTPStatus.CREATED, (
+            "Проверьте, что пост с изображением создаётся."
+        )
+        post = Post.objects.get(pk=response.json()["id"])
+        assert (media_root / post.image.name).read_bytes() == make_png()
+
+    def test_too_large(self, user_client, monkeypatch):
+        monkeypatch.setattr(uploads, "IMAGE_MAX_UPLOAD_SIZE", 100)
+        response = self.upload(user_client, make_png())
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что слишком большой файл отклоняется со статусом 400."
+        )
+        assert "image" in response.json()
+        assert not Post.objects.exists()
+
+    def test_too_many_pixels(self, user_client, monkeypatch):
+        monkeypatch.setattr(uploads, "IMAGE_MAX_PIXELS", 10_000)
+        response = self.upload(user_client, make_png())
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что изображение с избыточным числом пикселей "
+            "отклоняется со статусом 400."
+        )
+        assert "image" in response.json()
+        assert not Post.objects.exists()
+
+    def test_not_an_image(self, user_client):
+        response = self.upload(user_client, b"not an image" * 100)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "image" in response.json()
+
+
+def test_probe_reads_header_only():
+    header = BytesIO(make_png((4000, 3000))[:64])
+    assert uploads.probe_image(header, complete=False) == (
+        "PNG", (4000, 3000)
+    ), (
+        "Проверьте, что формат и размеры определяются по заголовку файла."
+    )
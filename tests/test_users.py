@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Follow, FollowStats
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUserProfiles:
+
+    users_url = "/api/v1/users/{username}/"
+    follow_url = "/api/v1/follow/"
+
+    def test_profile_counts(self, client, user, user_2, another_user,
+                            follow_1, follow_2, follow_3):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.users_url.format(username=user))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "username": user.username,
+            "followers_count": 1,
+            "following_count": 1,
+        }, "Проверьте, что профиль содержит счётчики подписок."
+        assert not any(
+            "COUNT(" in query["sql"] for query in queries.captured_queries
+        ), "Проверьте, что профиль не считает подписки через COUNT(*)."
+        data = client.get(self.users_url.format(username=another_user)).json()
+        assert data["followers_count"] == 2
+        response = client.get(self.users_url.format(username="nobody"))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_counts_follow_and_unfollow(self, user_client, user,
+                                        another_user):
+        response = user_client.post(
+            self.follow_url, {"following": another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert FollowStats.objects.get(pk=user.pk).following == 1
+        assert FollowStats.objects.get(pk=another_user.pk).followers == 1, (
+            "Проверьте, что подписка увеличивает счётчики обоих "
+            "пользователей."
+        )
+        user_client.delete(f"{self.follow_url}{response.json()['id']}/")
+        assert FollowStats.objects.get(pk=user.pk).following == 0
+        assert FollowStats.objects.get(pk=another_user.pk).followers == 0, (
+            "Проверьте, что отписка уменьшает счётчики обоих пользователей."
+        )
+
+    def test_followers_pages(self, client, user, django_user_model):
+        followers = [
+            django_user_model.objects.create_user(username=f"fan{index}")
+            for index in range(5)
+        ]
+        for follower in followers:
+            Follow.objects.create(user=follower, following=user)
+        url = self.users_url.format(username=user) + "followers/"
+        data = client.get(f"{url}?page_size=2").json()
+        assert set(data) == {"next", "previous", "results"}, (
+            "Проверьте, что список подписчиков отдаётся с курсорной "
+            "пагинацией."
+        )
+        received = [item["username"] for item in data["results"]]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            received.extend(item["username"] for item in data["results"])
+        assert received == [
+            follower.username for follower in reversed(followers)
+        ], (
+            "Проверьте, что подписчики идут от новых к старым без "
+            "пропусков и повторов."
+        )
+
+    def test_following_list(self, client, user, another_user, follow_1):
+        url = self.users_url.format(username=user) + "following/"
+        data = client.get(url).json()
+        assert data["results"] == [{"username": another_user.username}]
+        url = self.users_url.format(username=another_user) + "following/"
+        assert client.get(url).json()["results"] == []
+        url = self.users_url.format(username="nobody") + "following/"
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_no_user_list(self, client, user):
+        assert client.get("/api/v1/users/").status_code == (
+            HTTPStatus.NOT_FOUND
+        ), "Проверьте, что список всех пользователей не отдаётся."
@@ -1,5 +1,15 @@
+import mimetypes
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     name = "api"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+
+        # Без этого redoc.yaml отдаётся как application/octet-stream
+        # и не попадает под сжатие.
+        mimetypes.add_type("application/yaml", ".yaml")
+        mimetypes.add_type("application/yaml", ".yml")
@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_KEY = "api:user:{}"
+USER_CACHE_TIMEOUT = 300
+
+
+def user_cache_key(user_id):
+    return USER_KEY.format(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, который берёт пользователя из общего кеша.
+
+    В кеше по id пользователя лежат только поля для проверок: pk,
+    `is_active` и хеш пароля для `CHECK_REVOKE_TOKEN`. Остальные поля
+    пользователь запроса загружает из БД при первом обращении.
+
+    Запись сбрасывается при сохранении и удалении пользователя
+    (см. `api.signals`). Кеш должен быть общим для процессов (Redis,
+    Memcached) — иначе сброс виден только процессу, сохранившему
+    пользователя; вне DEBUG это требует проверка `api.E001`.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is None:
+            user = super().get_user(validated_token)
+            cache.set(key, {
+                "pk": user.pk,
+                "is_active": user.is_active,
+                "password_hash": get_md5_hash_password(user.password),
+            }, USER_CACHE_TIMEOUT)
+            return user
+        self.check_user(entry, validated_token)
+        return self.deferred_user(entry)
+
+    def check_user(self, entry, validated_token):
+        """Те же проверки, что JWTAuthentication делает после запроса."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry["is_active"]:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+            != entry["password_hash"]
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed"
+            )
+
+    def deferred_user(self, entry):
+        """Пользователь с pk и `is_active`, остальные поля отложены."""
+        values = {
+            self.user_model._meta.pk.attname: entry["pk"],
+            "is_active": entry["is_active"],
+        }
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            list(values),
+            [
+                values[field.attname]
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in values
+            ]
+        )
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Error, Tags, register
+
+# Бэкенды, у которых каждый процесс хранит свою копию кеша.
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Кеш пользователей JWT и счётчиков запросов должен быть общим.
+
+    Сброс записи при деактивации или смене пароля виден только через
+    общий кеш; с локальным другие процессы принимают токены
+    пользователя до истечения записи, а лимит запросов считается
+    в каждом процессе отдельно.
+    """
+    backend = settings.CACHES.get(DEFAULT_CACHE_ALIAS, {}).get("BACKEND")
+    if settings.DEBUG or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [Error(
+        "Кеш по умолчанию не общий для процессов.",
+        hint="Укажите в CACHES общий бэкенд: Redis или Memcached.",
+        id="api.E001",
+    )]
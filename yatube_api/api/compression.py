@@ -0,0 +1,103 @@
+import gzip
+
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Ответы короче этого порога отдаются как есть: выигрыш не окупает
+# заголовки и время на сжатие.
+MIN_SIZE = 1024
+# Для ответов на лету — быстрое сжатие, для статики — максимальное.
+BROTLI_QUALITY = 5
+STATIC_BROTLI_QUALITY = 11
+STATIC_GZIP_LEVEL = 9
+
+# Типы, которые имеет смысл сжимать; кроме них — весь `text/*`
+# и `+json`/`+xml`. Картинки, архивы и т. п. уже сжаты.
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/msgpack",
+    "application/xml",
+    "application/yaml",
+    "image/svg+xml",
+}
+
+# Кодировки в порядке предпочтения и расширения предсжатых файлов.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def available_encodings():
+    if brotli is None:
+        return [item for item in ENCODINGS if item[0] != "br"]
+    return list(ENCODINGS)
+
+
+def is_compressible(content_type):
+    mime = (content_type or "").split(";")[0].strip().lower()
+    return (
+        mime.startswith("text/")
+        or mime in COMPRESSIBLE_TYPES
+        or mime.endswith(("+json", "+xml"))
+    )
+
+
+def parse_accept_encoding(header):
+    """Кодировки из `Accept-Encoding`, которые клиент не запретил `q=0`."""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(request):
+    """Лучшая доступная кодировка для запроса и расширение её файлов."""
+    accepted = parse_accept_encoding(
+        request.META.get("HTTP_ACCEPT_ENCODING", "")
+    )
+    for encoding, suffix in available_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding, suffix
+    return None, None
+
+
+def compress(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content)
+
+
+def compress_stream(chunks, encoding):
+    if encoding != "br":
+        return compress_sequence(chunks)
+    return _brotli_sequence(chunks)
+
+
+def _brotli_sequence(chunks):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in chunks:
+        # Сбрасываем буфер на каждой части, чтобы клиент получал данные
+        # по мере генерации, а не в конце ответа.
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_static(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=STATIC_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=STATIC_GZIP_LEVEL, mtime=0)
@@ -0,0 +1,62 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.compression import (
+    MIN_SIZE, available_encodings, compress_static, is_compressible
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сохраняет рядом с файлами STATIC_ROOT сжатые копии .br и .gz. "
+        "Запускается после collectstatic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-size", type=int, default=MIN_SIZE)
+
+    def handle(self, *args, **options):
+        root = settings.STATIC_ROOT
+        if not root or not os.path.isdir(root):
+            raise CommandError(
+                "Каталог STATIC_ROOT не найден, сначала выполните "
+                "collectstatic."
+            )
+        suffixes = tuple(suffix for _, suffix in available_encodings())
+        written = 0
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(suffixes):
+                    continue
+                content_type, encoding = mimetypes.guess_type(filename)
+                if encoding is not None or not is_compressible(content_type):
+                    continue
+                path = os.path.join(directory, filename)
+                if os.path.getsize(path) < options["min_size"]:
+                    continue
+                written += self.compress_file(path)
+        self.stdout.write(f"Записано сжатых копий: {written}")
+
+    def compress_file(self, path):
+        modified = os.path.getmtime(path)
+        content = None
+        written = 0
+        for encoding, suffix in available_encodings():
+            target = path + suffix
+            if os.path.exists(target) and os.path.getmtime(target) >= modified:
+                continue
+            if content is None:
+                with open(path, "rb") as source:
+                    content = source.read()
+            compressed = compress_static(content, encoding)
+            if len(compressed) >= len(content):
+                if os.path.exists(target):
+                    os.remove(target)
+                continue
+            with open(target, "wb") as output:
+                output.write(compressed)
+            written += 1
+        return written
@@ -0,0 +1,63 @@
+from django.utils.cache import patch_vary_headers
+
+from .compression import (
+    MIN_SIZE, choose_encoding, compress, compress_stream, is_compressible
+)
+
+
+class CompressionMiddleware:
+    """Сжатие ответов в brotli (если установлен) или gzip.
+
+    Ответы короче `min_size`, уже сжатые и несжимаемых типов не
+    трогаются; потоковые ответы сжимаются по мере генерации.
+    """
+
+    min_size = MIN_SIZE
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.should_compress(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding, _ = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            # Итоговый размер потока заранее не известен.
+            if response.has_header("Content-Length"):
+                del response["Content-Length"]
+        else:
+            content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        # Сжатое тело уже не совпадает побайтно с исходным.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = encoding
+        return response
+
+    def should_compress(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if not is_compressible(response.get("Content-Type")):
+            return False
+        if response.streaming:
+            # Асинхронные итераторы обходим: сжатие здесь синхронное.
+            if getattr(response, "is_async", False):
+                return False
+            length = response.get("Content-Length")
+            return length is None or int(length) >= self.min_size
+        return len(response.content) >= self.min_size
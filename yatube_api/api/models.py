@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class RevokedToken(models.Model):
+    """Отозванный JWT; строки старше `expires_at` больше не нужны."""
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
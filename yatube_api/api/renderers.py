@@ -0,0 +1,68 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """JSON в байтах так же, как его отдаёт JSONRenderer DRF."""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    # Даты отдаём энкодеру DRF: он пишет UTC как `Z`, orjson — `+00:00`.
+    content = orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+    # Как и DRF, экранируем разделители строк, недопустимые в JavaScript.
+    return content.replace(
+        b"\xe2\x80\xa8", b"\\u2028"
+    ).replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson.
+
+    Без orjson, при запросе отступов (`indent` в Accept) или при
+    изменённых настройках `COMPACT_JSON`/`UNICODE_JSON` работает
+    стандартная реализация DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Ответ в MessagePack для клиентов с `Accept: application/msgpack`."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=_encoder.default, use_bin_type=True
+        )
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.utils import timezone as django_timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+# Как часто процесс подтягивает новые отзывы из БД и как часто
+# перечитывает список целиком, отбрасывая истёкшие токены.
+SYNC_INTERVAL = 5
+RELOAD_INTERVAL = 600
+# Насколько раньше последнего увиденного отзыва начинается следующая
+# подгрузка: строка, закоммиченная позже более новой (долгая транзакция,
+# расхождение часов процессов), всё равно попадёт в выборку.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def jti_hash(jti):
+    return int.from_bytes(
+        hashlib.blake2b(jti.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class RevocationSet:
+    """64-битные хеши отозванных JTI в памяти процесса.
+
+    Для действующего токена проверка не обращается к БД: раз в
+    `SYNC_INTERVAL` секунд подгружаются строки по `revoked_at`, начиная
+    с последнего увиденного отзыва минус `SYNC_OVERLAP`. При
+    совпадении хеша отзыв подтверждается запросом, чтобы коллизия
+    не отклонила чужой токен. Отзыв из другого процесса начинает
+    действовать не позже чем через `SYNC_INTERVAL` секунд.
+    """
+
+    def __init__(self):
+        self.hashes = set()
+        self.revoked_until = None
+        self.synced_at = None
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def add(self, jti):
+        self.hashes.add(jti_hash(jti))
+
+    def sync(self):
+        if self.is_fresh():
+            return
+        with self.lock:
+            if self.is_fresh():
+                return
+            now = time.monotonic()
+            if self.loaded_at is None or (
+                now - self.loaded_at >= RELOAD_INTERVAL
+            ):
+                self.reload()
+            else:
+                self.load(RevokedToken.objects.filter(
+                    revoked_at__gte=self.revoked_until - SYNC_OVERLAP
+                ))
+            self.synced_at = now
+
+    def is_fresh(self):
+        return self.synced_at is not None and (
+            time.monotonic() - self.synced_at < SYNC_INTERVAL
+        )
+
+    def reload(self):
+        self.hashes = set()
+        self.revoked_until = django_timezone.now()
+        self.load(RevokedToken.objects.filter(
+            expires_at__gt=django_timezone.now()
+        ))
+        self.loaded_at = time.monotonic()
+
+    def load(self, queryset):
+        for revoked_at, jti in queryset.values_list("revoked_at", "jti"):
+            self.hashes.add(jti_hash(jti))
+            self.revoked_until = max(self.revoked_until, revoked_at)
+
+    def is_revoked(self, jti):
+        if jti is None:
+            return False
+        self.sync()
+        if jti_hash(jti) not in self.hashes:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+
+revoked_tokens = RevocationSet()
+
+
+def revoke_token(token):
+    """Отзывает токен simplejwt до истечения его срока."""
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.get_or_create(
+        jti=jti,
+        defaults={"expires_at": datetime.fromtimestamp(
+            token["exp"], tz=timezone.utc
+        )}
+    )
+    revoked_tokens.add(jti)
+    RevokedToken.objects.filter(
+        expires_at__lte=django_timezone.now()
+    ).delete()
@@ -1,9 +1,16 @@
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
-
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer,
+    TokenVerifySerializer
+)
+from rest_framework_simplejwt.settings import api_settings
 
 from posts.models import Comment, Post
 
+from .tokens import RevocableRefreshToken, RevocableUntypedToken
+
 
 class PostSerializer(serializers.ModelSerializer):
     author = SlugRelatedField(slug_field="username", read_only=True)
@@ -20,3 +27,31 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = "__all__"
         model = Comment
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        RevocableUntypedToken(attrs["token"])
+        return super().validate(attrs)
+
+
+class RevokeTokenSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+    def validate_refresh(self, value):
+        try:
+            token = RevocableRefreshToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(error.args[0])
+        user = self.context["request"].user
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(
+            getattr(user, api_settings.USER_ID_FIELD)
+        ):
+            raise serializers.ValidationError(
+                "Токен выдан другому пользователю."
+            )
+        return token
@@ -0,0 +1,228 @@
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheCounterStore:
+    """Счётчики в кеше Django; в продакшене — общий Redis или Memcached,
+    где `incr` атомарен для всех процессов."""
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, timeout=timeout):
+                return 1
+            return self.cache.incr(key)
+
+    def decr(self, key):
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+    def clear(self):
+        self.cache.clear()
+
+
+class SQLiteCounterStore:
+    """Счётчики в файле SQLite — общий для процессов одной машины
+    заменитель Redis для разработки и тестов."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+        self.execute(
+            "CREATE TABLE IF NOT EXISTS throttle_counter ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, "
+            "expires REAL NOT NULL)"
+        )
+
+    @property
+    def connection(self):
+        if not hasattr(self.local, "connection"):
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # В режиме WAL это не портит файл при сбое, а лишь может
+            # потерять последние счётчики — зато без fsync на запрос.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return self.local.connection
+
+    def execute(self, sql, params=()):
+        return self.connection.execute(sql, params)
+
+    def get_many(self, keys):
+        placeholders = ",".join("?" * len(keys))
+        return dict(self.execute(
+            "SELECT key, count FROM throttle_counter "
+            f"WHERE key IN ({placeholders}) AND expires > ?",
+            (*keys, time.time())
+        ).fetchall())
+
+    def incr(self, key, timeout):
+        now = time.time()
+        (count,) = self.execute(
+            "INSERT INTO throttle_counter (key, count, expires) "
+            "VALUES (?, 1, ?) ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expires > ? THEN count + 1 ELSE 1 END, "
+            "expires = CASE WHEN expires > ? THEN expires "
+            "ELSE excluded.expires END "
+            "RETURNING count",
+            (key, now + timeout, now, now)
+        ).fetchone()
+        if count == 1:
+            # Новое окно — удобный момент убрать просроченные счётчики.
+            self.execute(
+                "DELETE FROM throttle_counter WHERE expires <= ?", (now,)
+            )
+        return count
+
+    def decr(self, key):
+        self.execute(
+            "UPDATE throttle_counter SET count = count - 1 "
+            "WHERE key = ? AND count > 0",
+            (key,)
+        )
+
+    def clear(self):
+        self.execute("DELETE FROM throttle_counter")
+
+
+@lru_cache(maxsize=None)
+def get_counter_store():
+    config = settings.THROTTLE_COUNTER_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение частоты по скользящему окну из двух счётчиков.
+
+    Вместо списка отметок времени хранятся только счётчики текущего
+    и предыдущего окна, а число запросов за последние `duration`
+    секунд оценивается как `previous * (1 - elapsed / duration) +
+    current`. Память на ключ постоянна, запрос стоит одного чтения
+    и одного атомарного инкремента в общем хранилище.
+
+    Счётчик увеличивается до сравнения с лимитом: параллельные запросы
+    получают разные значения, и сверх лимита не проходит ни один.
+    Отклонённый запрос возвращает счётчик назад.
+
+    `read` ограничивает класс чтением (True) или записью (False).
+    """
+
+    read = None
+
+    def get_cache_key(self, request, view):
+        if self.read is not None and (
+            (request.method in SAFE_METHODS) != self.read
+        ):
+            return None
+        ident = self.get_request_ident(request, view)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def get_request_ident(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        store = get_counter_store()
+        window, elapsed = divmod(self.timer(), self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+        previous = store.get_many([previous_key]).get(previous_key, 0)
+        current = store.incr(current_key, timeout=2 * self.duration)
+        estimate = previous * (1 - elapsed / self.duration) + current
+        if estimate > self.num_requests:
+            store.decr(current_key)
+            self.wait_time = self.get_wait(previous, current - 1, elapsed)
+            return False
+        return True
+
+    def get_wait(self, previous, current, elapsed):
+        if current >= self.num_requests:
+            # Ждём конца окна и пока его вес не опустится ниже лимита.
+            return (self.duration - elapsed) + self.duration * (
+                1 - self.num_requests / current
+            )
+        return max(
+            self.duration * (1 - (self.num_requests - current) / previous)
+            - elapsed,
+            0
+        )
+
+    def wait(self):
+        return self.wait_time
+
+
+class PerUserThrottle(SlidingWindowThrottle):
+    """Считает запросы аутентифицированного пользователя."""
+
+    def get_request_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class PerIPThrottle(SlidingWindowThrottle):
+    """Считает анонимные запросы по IP-адресу."""
+
+    def get_request_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserReadThrottle(PerUserThrottle):
+    scope = "user_read"
+    read = True
+
+
+class UserWriteThrottle(PerUserThrottle):
+    scope = "user_write"
+    read = False
+
+
+class AnonReadThrottle(PerIPThrottle):
+    scope = "anon_read"
+    read = True
+
+
+class AnonWriteThrottle(PerIPThrottle):
+    scope = "anon_write"
+    read = False
+
+
+class JWTCreateThrottle(SlidingWindowThrottle):
+    """Попытки получить токен (`/jwt/create/`) по IP-адресу."""
+
+    scope = "jwt_create"
+    url_name = "jwt-create"
+
+    def get_request_ident(self, request, view):
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.url_name == self.url_name:
+            return self.get_ident(request)
+        return None
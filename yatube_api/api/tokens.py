@@ -0,0 +1,31 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import (
+    AccessToken,
+    RefreshToken,
+    UntypedToken
+)
+
+from .revocation import revoked_tokens
+
+
+class RevocableTokenMixin:
+    """Отклоняет токены, отозванные через `api.revocation`."""
+
+    def verify(self):
+        super().verify()
+        if revoked_tokens.is_revoked(self.get(api_settings.JTI_CLAIM)):
+            raise TokenError(_("Token is revoked"))
+
+
+class RevocableAccessToken(RevocableTokenMixin, AccessToken):
+    pass
+
+
+class RevocableRefreshToken(RevocableTokenMixin, RefreshToken):
+    pass
+
+
+class RevocableUntypedToken(RevocableTokenMixin, UntypedToken):
+    pass
@@ -1,22 +1,30 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from api.views import RevokeTokenView
 from posts.views import (
     CommentViewSet,
+    FeedViewSet,
     FollowViewSet,
     GroupViewSet,
     PostViewSet,
+    UserViewSet,
 )
 
 router_v1 = DefaultRouter()
 router_v1.register("posts", PostViewSet, basename="posts")
 router_v1.register("groups", GroupViewSet, basename="groups")
 router_v1.register("follow", FollowViewSet, basename="follow")
+router_v1.register("feed", FeedViewSet, basename="feed")
+router_v1.register("users", UserViewSet, basename="users")
 router_v1.register(
     r"posts/(?P<post_id>\d+)/comments", CommentViewSet, basename="comments"
 )
 
 urlpatterns = [
     path("v1/", include(router_v1.urls)),
+    path(
+        "v1/jwt/revoke/", RevokeTokenView.as_view(), name="jwt-revoke"
+    ),
     path("v1/", include("djoser.urls.jwt")),
 ]
@@ -1 +1,50 @@
-# TODO:  Напишите свой вариант
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.views.static import serve
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .compression import choose_encoding
+from .revocation import revoke_token
+from .serializers import RevokeTokenSerializer
+
+
+def serve_static(request, path):
+    """Отдаёт файл из STATIC_ROOT, предпочитая предсжатую копию.
+
+    Копии `.br`/`.gz` готовит команда `compressstatic`; заголовки
+    Content-Type и Content-Encoding выставляет `serve()` по расширению.
+    """
+    encoding, suffix = choose_encoding(request)
+    response = None
+    if encoding is not None:
+        try:
+            response = serve(
+                request, path + suffix, document_root=settings.STATIC_ROOT
+            )
+        except Http404:
+            pass
+    if response is None:
+        response = serve(request, path, document_root=settings.STATIC_ROOT)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+class RevokeTokenView(APIView):
+    """Отзывает access-токен запроса и переданный refresh-токен."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        serializer = RevokeTokenSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        revoke_token(request.auth)
+        refresh = serializer.validated_data.get("refresh")
+        if refresh is not None:
+            revoke_token(refresh)
+        return Response(status=status.HTTP_204_NO_CONTENT)
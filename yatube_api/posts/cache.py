@@ -0,0 +1,128 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .constants import RESPONSE_CACHE_TIMEOUT
+
+VERSION_KEY = "posts:version:{}"
+MODIFIED_KEY = "posts:modified:{}"
+RESPONSE_KEY = "posts:response:{}"
+
+
+def get_versions(scopes):
+    """Текущие версии ресурсов; отсутствующие заводятся заново.
+
+    Новая версия берётся из времени, чтобы после вытеснения ключа
+    не совпасть с версией, под которой уже лежат старые ответы.
+    """
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def get_last_modified(scopes):
+    """Время последнего изменения ресурсов; неизвестное считается «сейчас»."""
+    keys = [MODIFIED_KEY.format(scope) for scope in scopes]
+    modified = cache.get_many(keys)
+    now = time.time()
+    for key in keys:
+        if key not in modified:
+            cache.add(key, now, timeout=None)
+            modified[key] = now
+    return max(modified.values())
+
+
+def bump_versions(*scopes):
+    """Повышает версии ресурсов после фиксации текущей транзакции.
+
+    До COMMIT другие запросы читают старые строки: версия, повышенная
+    раньше, сохранила бы в кэше старый ответ под новым ключом и ETag.
+    Вне транзакции версии повышаются сразу.
+    """
+    transaction.on_commit(lambda: increment_versions(scopes))
+
+
+def increment_versions(scopes):
+    now = time.time()
+    for scope in scopes:
+        key = VERSION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+        cache.set(MODIFIED_KEY.format(scope), now, timeout=None)
+
+
+def response_key(request, versions):
+    raw = "|".join([request.build_absolute_uri(), *map(str, versions)])
+    return RESPONSE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def cache_response(method):
+    """Кэширует ответ на анонимный GET, пока не сменится версия ресурса.
+
+    Версии перечисляет `get_cache_scopes()` вьюсета; их повышают сигналы
+    при изменении постов и комментариев, поэтому запись видна сразу
+    после фиксации транзакции.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return method(self, request, *args, **kwargs)
+        key = response_key(request, get_versions(self.get_cache_scopes()))
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = method(self, request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            cache.set(key, response.data, RESPONSE_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+def make_etag(request, versions):
+    raw = "|".join([
+        request.build_absolute_uri(),
+        request.META.get("HTTP_ACCEPT", ""),
+        *map(str, versions),
+    ])
+    return 'W/"{}"'.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def conditional_response(method):
+    """Отвечает 304 на If-None-Match/If-Modified-Since без сериализации.
+
+    ETag и Last-Modified строятся из версий ресурсов вьюсета,
+    так что для проверки не нужны ни выборка, ни тело ответа.
+    Версии меняются только после COMMIT, поэтому ETag не опережает
+    данные, которые видит запрос.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return method(self, request, *args, **kwargs)
+        scopes = self.get_cache_scopes()
+        etag = make_etag(request, get_versions(scopes))
+        last_modified = int(get_last_modified(scopes))
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response.setdefault("ETag", etag)
+        response.setdefault("Last-Modified", http_date(last_modified))
+        return response
+    return wrapper
@@ -1,3 +1,24 @@
 TITLE_DISPLAY_LENGTH = 20
 TEXT_DISPLAY_LENGTH = 30
 WORDS_DISPLAY_LENGTH = 5
+STREAM_CHUNK_SIZE = 500
+FEED_FANOUT_LIMIT = 1000
+FEED_BACKFILL_SIZE = 50
+RESPONSE_CACHE_TIMEOUT = 300
+BULK_CREATE_MAX_ITEMS = 500
+# Варианты Post.image: имя — максимальные ширина и высота.
+IMAGE_VARIANTS = {"thumb": (320, 320), "medium": (1080, 1080)}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_WORKERS = 2
+# Ограничения загружаемых изображений.
+IMAGE_MAX_UPLOAD_SIZE = 10 * 2 ** 20
+IMAGE_MAX_PIXELS = 40_000_000
+IMAGE_UPLOAD_CHUNK_SIZE = 64 * 2 ** 10
+IMAGE_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+# Дерево комментариев: ширина сегмента пути, глубина и размер выдачи.
+COMMENT_PATH_STEP = 10
+COMMENT_MAX_DEPTH = 8
+COMMENT_TREE_MAX_ITEMS = 500
+# Последние комментарии в списке постов (?expand=comments).
+EXPAND_COMMENTS_LIMIT = 3
+EXPAND_COMMENTS_MAX_LIMIT = 20
@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .fastpath import ValuesRepresentation
+from .models import Comment
+from .serializers import CommentSerializer
+
+
+def latest_comments(post_ids, limit):
+    """Последние `limit` комментариев каждого из постов одним запросом.
+
+    Комментарии постов нумеруются `ROW_NUMBER()` в окне по посту
+    от новых к старым, и остаются первые `limit` номеров.
+    """
+    return Comment.objects.filter(post_id__in=post_ids).alias(
+        position=Window(
+            RowNumber(),
+            partition_by=F("post_id"),
+            order_by=(F("created").desc(), F("id").desc())
+        )
+    ).filter(position__lte=limit).order_by("post_id", "-created", "-id")
+
+
+def attach_latest_comments(items, post_ids, limit):
+    """Добавляет к представлениям постов поле `comments`.
+
+    `items` и `post_ids` идут в одном порядке. Параметры `?fields=`
+    и `?exclude=` относятся к постам, поэтому сериализатор
+    комментариев создаётся без запроса в контексте.
+    """
+    grouped = defaultdict(list)
+    if post_ids and limit:
+        serializer = CommentSerializer()
+        queryset = latest_comments(post_ids, limit)
+        representation = ValuesRepresentation.for_serializer(serializer)
+        if representation is None:
+            rows = list(queryset.select_related("author"))
+            keys = [row.post_id for row in rows]
+            comments = CommentSerializer(rows, many=True).data
+        else:
+            rows = list(representation.get_queryset(queryset, ["post"]))
+            keys = [row["post"] for row in rows]
+            comments = representation.represent(rows)
+        for post_id, comment in zip(keys, comments):
+            grouped[post_id].append(comment)
+    for item, post_id in zip(items, post_ids):
+        item["comments"] = grouped[post_id]
+    return items
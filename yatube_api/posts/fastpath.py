@@ -0,0 +1,105 @@
+from rest_framework import relations, serializers
+
+
+class ValuesRepresentation:
+    """Представление сериализатора только для чтения по строкам `.values()`.
+
+    Поля сериализатора один раз сводятся к парам «поле выборки —
+    преобразование», поэтому на каждую строку не создаются ни модели,
+    ни вызовы `get_attribute()`. Результат совпадает с `serializer.data`.
+    Поле, которому нужно несколько колонок, объявляет их в
+    `values_lookups` и строит значение методом `from_values()`.
+    Если сериализатор содержит поле, которое так не выразить,
+    `for_serializer()` возвращает None и используется обычный путь.
+    """
+
+    def __init__(self, accessors, composites=()):
+        self.accessors = accessors
+        self.composites = composites
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        model = serializer.Meta.model
+        request = serializer.context.get("request")
+        accessors = []
+        composites = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if getattr(field, "values_lookups", None):
+                # Место в словаре занимаем сразу, чтобы сохранить порядок.
+                lookups = tuple(field.values_lookups)
+                accessors.append((name, lookups[0], None))
+                composites.append((name, lookups, field.from_values))
+                continue
+            accessor = build_accessor(field, model, request)
+            if accessor is None:
+                return None
+            accessors.append((name, *accessor))
+        return cls(accessors, composites)
+
+    @property
+    def lookups(self):
+        lookups = [lookup for _, lookup, _ in self.accessors]
+        for _, extra, _ in self.composites:
+            lookups += [item for item in extra if item not in lookups]
+        return lookups
+
+    def get_queryset(self, queryset, extra_lookups=()):
+        lookups = self.lookups
+        lookups += [item for item in extra_lookups if item not in lookups]
+        return queryset.values(*lookups)
+
+    def to_representation(self, row):
+        data = {
+            name: row[lookup] if convert is None or row[lookup] is None
+            else convert(row[lookup])
+            for name, lookup, convert in self.accessors
+        }
+        for name, lookups, from_values in self.composites:
+            data[name] = from_values(*(row[lookup] for lookup in lookups))
+        return data
+
+    def represent(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+def build_accessor(field, model, request):
+    """Пара `(поле выборки, преобразование или None)` для поля DRF."""
+    if field.source == "*" or len(field.source_attrs) != 1:
+        return None
+    source = field.source
+    if isinstance(field, relations.SlugRelatedField):
+        return f"{source}__{field.slug_field}", None
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            return source, field.pk_field.to_representation
+        return source, None
+    if isinstance(field, serializers.FileField):
+        return source, file_url_converter(field, model, request)
+    if isinstance(field, (
+        relations.RelatedField,
+        relations.ManyRelatedField,
+        serializers.BaseSerializer,
+        serializers.SerializerMethodField,
+    )):
+        return None
+    if isinstance(field, (serializers.IntegerField, serializers.CharField)):
+        return source, None
+    return source, field.to_representation
+
+
+def file_url_converter(field, model, request):
+    storage = model._meta.get_field(field.source).storage
+    use_url = getattr(field, "use_url", True)
+
+    def convert(name):
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
@@ -0,0 +1,82 @@
+from .constants import FEED_BACKFILL_SIZE, FEED_FANOUT_LIMIT
+from .models import FeedEntry, Follow, FollowStats, Post
+
+
+def is_pull_author(author_id):
+    return FollowStats.objects.filter(
+        pk=author_id, followers__gte=FEED_FANOUT_LIMIT
+    ).exists()
+
+
+def fan_out_posts(posts):
+    """Раскладывает новые посты по лентам подписчиков их авторов."""
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    for author_id, author_posts in by_author.items():
+        if is_pull_author(author_id):
+            # Режим сохраняется в посте: если подписчиков станет меньше
+            # порога, посты по-прежнему будут читаться при запросе.
+            for post in author_posts:
+                post.feed_pull = True
+            Post.objects.filter(
+                pk__in=[post.pk for post in author_posts]
+            ).update(feed_pull=True)
+            continue
+        follower_ids = list(
+            Follow.objects.filter(
+                following_id=author_id
+            ).values_list("user_id", flat=True)
+        )
+        FeedEntry.objects.bulk_create(
+            (
+                FeedEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+                for user_id in follower_ids
+                for post in author_posts
+            ),
+            batch_size=FEED_FANOUT_LIMIT,
+            ignore_conflicts=True
+        )
+
+
+def backfill_feed(user_id, author_id):
+    """Добавляет в ленту последние разложенные посты автора после подписки.
+
+    Посты, опубликованные в режиме чтения, лента и так берёт при запросе.
+    """
+    posts = Post.objects.filter(
+        author_id=author_id, feed_pull=False
+    ).order_by("-pub_date", "-id").values_list("id", "pub_date")
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for post_id, pub_date in posts[:FEED_BACKFILL_SIZE]
+        ),
+        ignore_conflicts=True
+    )
+
+
+def prune_feed(user_id, author_id):
+    FeedEntry.objects.filter(
+        user_id=user_id, post__author_id=author_id
+    ).delete()
+
+
+def timeline_sources(user):
+    return (
+        (
+            FeedEntry.objects.filter(
+                user=user
+            ).values_list("pub_date", "post_id"),
+            ("-pub_date", "-post_id"),
+        ),
+        (
+            Post.objects.filter(
+                feed_pull=True,
+                author_id__in=Follow.objects.filter(
+                    user=user
+                ).values("following_id")
+            ).values_list("pub_date", "id"),
+            ("-pub_date", "-id"),
+        ),
+    )
@@ -0,0 +1,22 @@
+from django.db.models import F
+
+from .models import FollowStats
+
+
+def change_follow_counts(user_id, following_id, delta):
+    """Меняет на `delta` число подписок `user_id` и подписчиков
+    `following_id`.
+
+    Вызывается в транзакции подписки или отписки. Строка счётчиков
+    создаётся при первой подписке; ниже нуля счётчики не опускаются.
+    """
+    for pk, field in ((user_id, "following"), (following_id, "followers")):
+        counts = FollowStats.objects.filter(pk=pk)
+        if delta < 0:
+            counts = counts.filter(**{f"{field}__gte": -delta})
+        if counts.update(**{field: F(field) + delta}) or delta < 0:
+            continue
+        FollowStats.objects.bulk_create(
+            [FollowStats(user_id=pk)], ignore_conflicts=True
+        )
+        counts.update(**{field: F(field) + delta})
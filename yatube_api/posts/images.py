@@ -0,0 +1,143 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from PIL import Image
+
+from .cache import bump_versions
+from .constants import IMAGE_VARIANT_QUALITY, IMAGE_VARIANTS, IMAGE_WORKERS
+from .models import Post, StoredFile
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    # Pillow отпускает GIL при масштабировании и кодировании,
+    # поэтому хватает потоков внутри процесса.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=IMAGE_WORKERS, thread_name_prefix="post-images"
+        )
+    return _executor
+
+
+def get_storage():
+    return Post._meta.get_field("image").storage
+
+
+def variants_ready(post):
+    return post.image_variants.get("source") == post.image.name
+
+
+def schedule_variants(post):
+    """Ставит в очередь построение вариантов после коммита транзакции."""
+    name = post.image.name
+    transaction.on_commit(
+        lambda: get_executor().submit(_build_in_worker, post.pk, name)
+    )
+
+
+def _build_in_worker(post_id, name):
+    try:
+        build_variants(post_id, name)
+    finally:
+        # Соединения с БД у каждого потока свои, закрываем их сами.
+        connections.close_all()
+
+
+def variant_name(name, variant):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{variant}.webp"
+
+
+def render_variant(image, size):
+    variant = image.copy()
+    variant.thumbnail(size)
+    if variant.mode not in ("RGB", "RGBA"):
+        variant = variant.convert("RGBA" if "A" in variant.mode else "RGB")
+    buffer = BytesIO()
+    variant.save(buffer, "WEBP", quality=IMAGE_VARIANT_QUALITY)
+    return buffer.getvalue()
+
+
+def build_variants(post_id, name):
+    """Строит WebP-варианты файла `name` и записывает их в пост.
+
+    Если за это время изображение поста заменили, результат
+    не сохраняется: варианты построятся для нового файла.
+    """
+    storage = get_storage()
+    try:
+        variants = {"source": name}
+        with storage.open(name) as source, Image.open(source) as image:
+            image.load()
+            for variant, size in IMAGE_VARIANTS.items():
+                target = variant_name(name, variant)
+                # Имя файла — хеш содержимого, поэтому готовые варианты
+                # того же файла из другого поста подходят как есть.
+                if not storage.exists(target):
+                    target = storage.save_derived(
+                        target, ContentFile(render_variant(image, size))
+                    )
+                variants[variant] = target
+        if Post.objects.filter(pk=post_id, image=name).update(
+            image_variants=variants
+        ):
+            bump_versions("posts", f"post:{post_id}")
+    except Exception:
+        logger.exception("Не удалось построить варианты для %s", name)
+
+
+def acquire_image(name):
+    """Учитывает ещё одну ссылку на файл изображения."""
+    references = StoredFile.objects.filter(name=name)
+    if references.update(refcount=F("refcount") + 1):
+        return
+    try:
+        with transaction.atomic():
+            StoredFile.objects.create(name=name, refcount=1)
+    except IntegrityError:
+        references.update(refcount=F("refcount") + 1)
+
+
+def release_image(name):
+    """Снимает ссылку на файл; файлы без ссылок удаляются после коммита."""
+    if StoredFile.objects.filter(name=name, refcount__gt=0).update(
+        refcount=F("refcount") - 1
+    ):
+        transaction.on_commit(lambda: delete_image_files(name))
+
+
+def delete_image_files(name):
+    """Удаляет файл и его варианты, если ссылок на него не осталось.
+
+    Строка `StoredFile` удаляется в одной транзакции с файлами и до
+    коммита заблокирована: `acquire_image()` того же имени ждёт её,
+    а повторную загрузку, которая уже решила не писать файл,
+    исправляет `restore_image_file()`.
+    """
+    with transaction.atomic():
+        deleted, _ = StoredFile.objects.filter(name=name, refcount=0).delete()
+        if not deleted:
+            return
+        storage = get_storage()
+        for file_name in (name, *(
+            variant_name(name, variant) for variant in IMAGE_VARIANTS
+        )):
+            storage.delete(file_name)
+
+
+def restore_image_file(name, content):
+    """Записывает загруженный файл заново, если его удалили между
+    проверкой в `storage.save()` и `acquire_image()`."""
+    storage = get_storage()
+    if content is None or storage.exists(name):
+        return
+    storage.save_derived(name, content)
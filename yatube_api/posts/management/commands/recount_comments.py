@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.cache import bump_versions
+from posts.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает Post.comment_count пачками и исправляет расхождения."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        actual = Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    post=OuterRef("pk")
+                ).values("post").annotate(
+                    total=Count("id")
+                ).values("total")
+            ),
+            0
+        )
+        last_pk = 0
+        fixed = 0
+        while True:
+            ids = list(
+                Post.objects.filter(pk__gt=last_pk).order_by(
+                    "pk"
+                ).values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+            # Пересчёт и запись в одном UPDATE: комментарий, созданный
+            # между отдельными чтением и записью, потерялся бы.
+            updated = Post.objects.filter(pk__in=ids).exclude(
+                comment_count=actual
+            ).update(comment_count=actual)
+            if updated:
+                bump_versions("posts", *(f"post:{pk}" for pk in ids))
+                fixed += updated
+        self.stdout.write(f"Исправлено постов: {fixed}")
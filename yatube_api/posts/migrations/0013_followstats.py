@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def count_follows(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    FollowStats = apps.get_model('posts', 'FollowStats')
+    stats = {}
+    for user_id, total in Follow.objects.values_list('user').annotate(
+        total=Count('id')
+    ).order_by():
+        counts = stats.setdefault(user_id, FollowStats(user_id=user_id))
+        counts.following = total
+    for user_id, total in Follow.objects.values_list('following').annotate(
+        total=Count('id')
+    ).order_by():
+        counts = stats.setdefault(user_id, FollowStats(user_id=user_id))
+        counts.followers = total
+    FollowStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0012_comment_parent_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='follow_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('followers', models.PositiveIntegerField(default=0)),
+                ('following', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+from posts.constants import FEED_FANOUT_LIMIT
+from posts.operations import AddIndexConcurrently
+
+
+def mark_pull_posts(apps, schema_editor):
+    # Раньше режим определялся при чтении по текущему числу подписчиков:
+    # посты таких авторов в ленты не раскладывались.
+    FollowStats = apps.get_model('posts', 'FollowStats')
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.filter(
+        author_id__in=FollowStats.objects.filter(
+            followers__gte=FEED_FANOUT_LIMIT
+        ).values('user_id')
+    ).update(feed_pull=True)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('posts', '0013_followstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='feed_pull',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_pull_posts, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='post',
+            index=models.Index(condition=models.Q(('feed_pull', True)), fields=['author', '-pub_date', '-id'], name='posts_post_pull_date_idx'),
+        ),
+    ]
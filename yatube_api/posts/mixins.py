@@ -0,0 +1,186 @@
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .constants import BULK_CREATE_MAX_ITEMS
+from .fastpath import ValuesRepresentation
+from .serializers import EXCLUDE_PARAM, FIELDS_PARAM
+
+
+class EagerLoadingMixin:
+    """Загружает связи, которые читает сериализатор, вместе с выборкой.
+
+    Вьюсет перечисляет отношения в `select_related_fields` и
+    `prefetch_related_fields`, и стоимость страницы в запросах
+    не зависит от числа строк в ней. Если клиент запросил часть полей
+    (`?fields=`/`?exclude=`), выборка сужается через `only()`,
+    а связи, которых нет в ответе, не подгружаются.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        loaded = self.get_loaded_fields()
+        select_related = self.select_related_fields
+        if loaded is not None:
+            roots = {lookup.split('__')[0] for lookup in loaded}
+            select_related = [
+                name for name in select_related if name in roots
+            ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(
+                *self.prefetch_related_fields
+            )
+        if loaded is not None:
+            queryset = queryset.only(*loaded)
+        return queryset
+
+    def get_loaded_fields(self):
+        """Поля для `only()` или None, если нужны все поля."""
+        params = self.request.query_params
+        if self.request.method != 'GET' or not (
+            params.get(FIELDS_PARAM) or params.get(EXCLUDE_PARAM)
+        ):
+            return None
+        representation = ValuesRepresentation.for_serializer(
+            self.get_serializer()
+        )
+        if representation is None:
+            return None
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        return representation.lookups + [
+            field.lstrip('-') for field in ordering
+        ]
+
+
+class BulkCreateMixin:
+    """POST `<список>/bulk/`: пачка объектов проверяется сериализатором
+    с `many=True` и вставляется одним `bulk_create` в транзакции.
+
+    Ответ — список той же длины, что и запрос: созданные объекты
+    со статусом 201 или ошибки по каждому элементу со статусом 400.
+    """
+
+    bulk_create_max_items = BULK_CREATE_MAX_ITEMS
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        if not isinstance(request.data, list) or not request.data:
+            raise ValidationError(
+                {'non_field_errors': ['Ожидается непустой список объектов.']}
+            )
+        if len(request.data) > self.bulk_create_max_items:
+            raise ValidationError({'non_field_errors': [
+                'Не больше {} объектов за запрос.'.format(
+                    self.bulk_create_max_items
+                )
+            ]})
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                self.get_item_errors(serializer.errors, len(request.data)),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        with transaction.atomic():
+            objects = self.perform_bulk_create(serializer)
+        return Response(
+            self.get_serializer(objects, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    def get_item_errors(self, errors, count):
+        # Новые версии DRF отдают ошибки словарём по номерам элементов.
+        if isinstance(errors, list):
+            return errors
+        return [
+            errors.get(str(index), errors.get(index, {}))
+            for index in range(count)
+        ]
+
+    def perform_bulk_create(self, serializer):
+        model = serializer.child.Meta.model
+        extra = self.get_bulk_create_kwargs()
+        objects = model.objects.bulk_create(
+            model(**item, **extra) for item in serializer.validated_data
+        )
+        self.after_bulk_create(objects)
+        return objects
+
+    def get_bulk_create_kwargs(self):
+        return {}
+
+    def after_bulk_create(self, objects):
+        """Действия, которые при обычном `save()` выполняют сигналы."""
+
+
+class ListPaginatorMixin:
+    """Пагинатор выбирается по параметрам запроса в `get_list_paginator()`.
+
+    Без параметров пагинации список отдаётся целиком.
+    """
+
+    def get_list_paginator(self):
+        return None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.get_list_paginator()
+        return self._paginator
+
+
+class ValuesRepresentationMixin:
+    """Списки строятся из `.values()` без создания моделей.
+
+    Если сериализатор нельзя выразить через `ValuesRepresentation`,
+    список сериализуется обычным образом. Ответ со списком отдаёт
+    `list_values()`; маршрут списка добавляет `ValuesListMixin`.
+    """
+
+    def get_list_representation(self):
+        if not hasattr(self, '_list_representation'):
+            self._list_representation = ValuesRepresentation.for_serializer(
+                self.get_serializer()
+            )
+        return self._list_representation
+
+    def get_list_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        representation = self.get_list_representation()
+        if representation is None:
+            return queryset
+        return representation.get_queryset(
+            queryset, self.get_list_lookups()
+        )
+
+    def get_list_lookups(self):
+        """Поля выборки, которые нужны списку помимо полей ответа."""
+        # Курсорной пагинации нужны поля сортировки даже вне ответа.
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        return [field.lstrip('-') for field in ordering]
+
+    def represent_list(self, items):
+        representation = self.get_list_representation()
+        if representation is None:
+            return self.get_serializer(items, many=True).data
+        return representation.represent(items)
+
+    def list_values(self):
+        queryset = self.get_list_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.represent_list(page))
+        return Response(self.represent_list(queryset))
+
+
+class ValuesListMixin(ValuesRepresentationMixin):
+    """Действие `list` на основе `ValuesRepresentationMixin`."""
+
+    def list(self, request, *args, **kwargs):
+        return self.list_values()
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .storage import content_storage
+
 User = get_user_model()
 
 
@@ -21,7 +23,19 @@ class Post(models.Model):
         on_delete=models.CASCADE,
         related_name="posts"
     )
-    image = models.ImageField(upload_to="posts/", null=True, blank=True)
+    image = models.ImageField(
+        upload_to="posts/",
+        storage=content_storage,
+        null=True,
+        blank=True
+    )
+    # Имя исходного файла («source») и файлы его вариантов; заполняется
+    # в фоне, см. posts.images.
+    image_variants = models.JSONField(
+        "Варианты изображения",
+        default=dict,
+        editable=False
+    )
     group = models.ForeignKey(
         Group,
         on_delete=models.SET_NULL,
@@ -29,6 +43,36 @@ class Post(models.Model):
         blank=True,
         null=True
     )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False
+    )
+    # Режим ленты, выбранный при публикации: пост автора, у которого
+    # было не меньше FEED_FANOUT_LIMIT подписчиков, не раскладывается
+    # по лентам, а читается при запросе. См. posts.feed.
+    feed_pull = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-pub_date", "-id"],
+                name="posts_post_date_idx"
+            ),
+            models.Index(
+                fields=["group", "-pub_date", "-id"],
+                name="posts_post_group_date_idx"
+            ),
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="posts_post_author_date_idx"
+            ),
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                condition=models.Q(feed_pull=True),
+                name="posts_post_pull_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]  # Лучше не возвращать весь текст
@@ -45,6 +89,15 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name="comments"
     )
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        related_name="replies",
+        blank=True,
+        null=True
+    )
+    # Материализованный путь: id предков и свой, см. posts.threads.
+    path = models.CharField(max_length=255, editable=False, default="")
     text = models.TextField()
     created = models.DateTimeField(
         "Дата добавления",
@@ -52,6 +105,18 @@ class Comment(models.Model):
         db_index=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "created", "id"],
+                name="posts_comment_post_date_idx"
+            ),
+            models.Index(
+                fields=["post", "path"],
+                name="posts_comment_post_path_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.text[:15]
 
@@ -75,6 +140,73 @@ class Follow(models.Model):
                 name="unique_follower"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["following", "user"],
+                name="posts_follow_following_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} follows {self.following.username}"
+
+
+class FollowStats(models.Model):
+    """Число подписчиков и подписок пользователя.
+
+    Обновляется вместе с каждой подпиской и отпиской, чтобы профилю
+    не нужен был COUNT(*) по Follow.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="follow_stats"
+    )
+    followers = models.PositiveIntegerField(default=0)
+    following = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.followers}/{self.following}"
+
+
+class FeedEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="feed_entries"
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="feed_entries"
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"],
+                name="unique_feed_entry"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-pub_date", "-post"],
+                name="posts_feed_user_date_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} in feed of {self.user_id}"
+
+
+class StoredFile(models.Model):
+    """Число постов, ссылающихся на файл в `content_storage`."""
+
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
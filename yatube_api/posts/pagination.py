@@ -0,0 +1,199 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Постраничный вывод по ключу сортировки без OFFSET и COUNT(*).
+
+    Курсор — непрозрачный токен с позицией последней (или первой)
+    записи страницы, поэтому стоимость страницы не зависит от её номера.
+    """
+
+    ordering = ("-id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Некорректный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, self.reverse = self.decode_cursor(request)
+
+        queryset = self.filter_after(queryset, self.ordering, position)
+        rows = list(queryset[:self.page_size + 1])
+        return self.set_page(rows, position)
+
+    def set_page(self, rows, position):
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, ordering):
+        if not self.reverse:
+            return ordering
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in ordering
+        )
+
+    def filter_after(self, queryset, ordering, position):
+        """Сортирует выборку и оставляет строки после позиции курсора."""
+        ordering = self.get_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is None:
+            return queryset
+        try:
+            return queryset.filter(
+                self.get_position_filter(ordering, position)
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position_filter(self, ordering, position):
+        """Лексикографическое условие «строго после позиции»."""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            lookup = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{field.lstrip('-')}__{lookup}": position[index]})
+            for previous, value in zip(ordering[:index], position):
+                term &= Q(**{previous.lstrip("-"): value})
+            condition |= term
+        return condition
+
+    def get_position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(item, dict):
+                value = item[name]
+            else:
+                value = getattr(item, name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = payload["p"]
+            reverse = bool(payload.get("r"))
+        except (TypeError, KeyError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": position}
+        if reverse:
+            payload["r"] = 1
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+
+class PostCursorPagination(KeysetPagination):
+    ordering = ("-pub_date", "-id")
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering = ("created", "id")
+
+
+class FollowCursorPagination(KeysetPagination):
+    ordering = ("-id",)
+
+
+class FeedPagination(KeysetPagination):
+    """Курсорная пагинация ленты, собранной из нескольких источников.
+
+    Каждый источник — выборка пар `(pub_date, post_id)` и поля её
+    сортировки. Из каждого берётся не больше страницы, результаты
+    сливаются, а посты загружаются одним запросом.
+    """
+
+    ordering = ("-pub_date", "-id")
+
+    def paginate_sources(self, sources, posts, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, self.reverse = self.decode_cursor(request)
+
+        keys = {}
+        for queryset, ordering in sources:
+            queryset = self.filter_after(queryset, ordering, position)
+            for pub_date, post_id in queryset[:self.page_size + 1]:
+                keys[post_id] = (pub_date, post_id)
+        keys = sorted(keys.values(), reverse=not self.reverse)
+        keys = keys[:self.page_size + 1]
+
+        found = posts.in_bulk([post_id for _, post_id in keys])
+        rows = [found[post_id] for _, post_id in keys if post_id in found]
+        return self.set_page(rows, position)
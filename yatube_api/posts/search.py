@@ -0,0 +1,106 @@
+from django.db import DatabaseError, connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+SEARCH_TABLE = "posts_post_fts"
+POST_TABLE = "posts_post"
+
+CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"text, content='{POST_TABLE}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+CREATE_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai "
+    f"AFTER INSERT ON {POST_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, text) VALUES (new.id, new.text); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad "
+    f"AFTER DELETE ON {POST_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au "
+    f"AFTER UPDATE OF text ON {POST_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, text) VALUES (new.id, new.text); "
+    "END",
+)
+REBUILD = f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+
+
+def install_search_index(using="default", **kwargs):
+    """Создаёт FTS5-индекс постов и триггеры синхронизации.
+
+    Вызывается после каждого `migrate`: пересборка таблицы `posts_post`
+    в SQLite удаляет триггеры, поэтому недостающие создаются заново,
+    а индекс перестраивается.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE name LIKE %s AND type IN ('table', 'trigger')",
+            (f"{SEARCH_TABLE}%",)
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        try:
+            cursor.execute(CREATE_TABLE)
+        except DatabaseError:
+            # SQLite собран без FTS5 — поиск остаётся на LIKE.
+            connection.posts_search_index = False
+            return
+        for statement in CREATE_TRIGGERS:
+            cursor.execute(statement)
+        expected = {SEARCH_TABLE} | {
+            f"{SEARCH_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")
+        }
+        if not expected <= existing:
+            cursor.execute(REBUILD)
+    connection.posts_search_index = True
+
+
+def search_index_available(connection):
+    available = getattr(connection, "posts_search_index", None)
+    if available is None:
+        available = (
+            connection.vendor == "sqlite"
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+        connection.posts_search_index = available
+    return available
+
+
+def build_match_query(terms):
+    """Каждый термин — фраза с поиском по префиксу, термины через AND."""
+    return " ".join(
+        '"{}"*'.format(term.replace('"', '""')) for term in terms
+    )
+
+
+class PostSearchFilter(filters.SearchFilter):
+    """Поиск по тексту постов через FTS5 с сортировкой по релевантности.
+
+    Если индекса нет (другая СУБД или SQLite без FTS5), работает как
+    обычный `SearchFilter`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        connection = connections[queryset.db]
+        if not terms or not search_index_available(connection):
+            return super().filter_queryset(request, queryset, view)
+        match = build_match_query(terms)
+        # Индекс присоединяется один раз: MATCH и rank считаются в одном
+        # проходе, а не подзапросом на каждую найденную строку.
+        return queryset.extra(
+            tables=[SEARCH_TABLE],
+            where=[
+                f"{SEARCH_TABLE} MATCH %s",
+                f"{SEARCH_TABLE}.rowid = {POST_TABLE}.id",
+            ],
+            params=[match]
+        ).order_by(RawSQL(f"{SEARCH_TABLE}.rank", ()), "-id")
@@ -1,36 +1,178 @@
+from django.db import IntegrityError, transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 
+from .constants import COMMENT_MAX_DEPTH, IMAGE_VARIANTS
 from .models import Comment, Follow, Group, Post, User
+from .threads import path_depth
+from .uploads import probe_image
 
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+FOLLOW_EXISTS_MESSAGE = "Вы уже подписаны на этого пользователя."
+SELF_FOLLOW_MESSAGE = "Нельзя подписаться на самого себя!"
 
-class PostSerializer(serializers.ModelSerializer):
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsetsMixin:
+    """Оставляет поля из `?fields=` и убирает поля из `?exclude=`.
+
+    Параметры действуют только на GET-запросы и только на корневой
+    сериализатор, вложенные сериализаторы их не видят.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if (
+            request is None
+            or request.method != "GET"
+            or not self.is_root_serializer()
+        ):
+            return fields
+        params = getattr(request, "query_params", request.GET)
+        if params.get(FIELDS_PARAM):
+            requested = parse_field_names(params[FIELDS_PARAM])
+            for name in list(fields):
+                if name not in requested:
+                    del fields[name]
+        for name in parse_field_names(params.get(EXCLUDE_PARAM, "")):
+            fields.pop(name, None)
+        return fields
+
+    def is_root_serializer(self):
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+
+
+class UploadedImageField(serializers.FileField):
+    """Изображение, проверенное по заголовку без декодирования пикселей.
+
+    Файлы от `ImageUploadHandler` уже проверены при загрузке.
+    """
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        if getattr(file, "image_info", None) is None:
+            file.image_info = probe_image(file)
+        return file
+
+
+class ImageVariantsField(serializers.Field):
+    """URL вариантов изображения поста по именам из `IMAGE_VARIANTS`.
+
+    Пока варианты не построены, для каждого отдаётся URL оригинала.
+    """
+
+    values_lookups = ("image", "image_variants")
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, post):
+        return self.from_values(post.image.name, post.image_variants)
+
+    def from_values(self, image, variants):
+        if not image:
+            return None
+        if variants.get("source") != image:
+            variants = {}
+        storage = Post._meta.get_field("image").storage
+        request = self.context.get("request")
+        urls = {}
+        for variant in IMAGE_VARIANTS:
+            url = storage.url(variants.get(variant, image))
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls[variant] = url
+        return urls
+
+
+class CommentDepthField(serializers.ReadOnlyField):
+    """Уровень вложенности комментария, вычисленный по его пути."""
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "path"
+        super().__init__(**kwargs)
+
+    def to_representation(self, path):
+        return path_depth(path)
+
+
+class PostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field="username"
     )
-    image = serializers.ImageField(required=False)
+    image = UploadedImageField(required=False)
+    image_variants = ImageVariantsField()
 
     class Meta:
-        fields = "__all__"
+        exclude = ("feed_pull",)
         model = Post
-        read_only_fields = ("author", "pub_date")
+        read_only_fields = ("author", "pub_date", "comment_count")
+
+    def update(self, instance, validated_data):
+        # comment_count и image_variants меняются отдельными UPDATE,
+        # пока идёт запрос; полный save() вернул бы им старые значения.
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field="username"
     )
     post = serializers.PrimaryKeyRelatedField(read_only=True)
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.all(),
+        required=False,
+        allow_null=True
+    )
+    depth = CommentDepthField()
 
     class Meta:
         model = Comment
-        fields = ("id", "text", "author", "post", "created")
+        fields = ("id", "text", "author", "post", "parent", "depth",
+                  "created")
         read_only_fields = ("author", "created", "post")
 
+    def validate_parent(self, parent):
+        if self.instance is not None:
+            if parent != self.instance.parent:
+                raise serializers.ValidationError(
+                    "Нельзя перенести комментарий в другую ветку."
+                )
+            return parent
+        if parent is None:
+            return parent
+        view = self.context.get("view")
+        post_id = view.kwargs.get("post_id") if view is not None else None
+        if post_id is not None and parent.post_id != int(post_id):
+            raise serializers.ValidationError(
+                "Можно ответить только на комментарий к этому посту."
+            )
+        if path_depth(parent.path) >= COMMENT_MAX_DEPTH:
+            raise serializers.ValidationError(
+                "Ответы вкладываются не глубже {} уровней.".format(
+                    COMMENT_MAX_DEPTH
+                )
+            )
+        return parent
+
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         fields = "__all__"
         model = Group
@@ -55,13 +197,124 @@ class FollowSerializer(serializers.ModelSerializer):
             UniqueTogetherValidator(
                 queryset=Follow.objects.all(),
                 fields=["user", "following"],
-                message="Вы уже подписаны на этого пользователя.",
+                message=FOLLOW_EXISTS_MESSAGE,
             )
         ]
 
     def validate(self, data):
         if self.context["request"].user == data["following"]:
-            raise serializers.ValidationError(
-                "Нельзя подписаться на самого себя!"
+            raise serializers.ValidationError(SELF_FOLLOW_MESSAGE)
+        return data
+
+
+class UsernameField(serializers.CharField):
+    """Имя пользователя без запроса к БД с ошибками `SlugRelatedField`.
+
+    Связанное поле считает пустую строку null, а значение любого
+    другого типа ищет как есть и сообщает, что такого объекта нет.
+    """
+
+    default_error_messages = {
+        "does_not_exist": serializers.SlugRelatedField.default_error_messages[
+            "does_not_exist"
+        ],
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("trim_whitespace", False)
+        super().__init__(**kwargs)
+
+    def run_validation(self, data=serializers.empty):
+        if data == "":
+            data = None
+        return super().run_validation(data)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool) or not isinstance(data, (str, int, float)):
+            self.fail(
+                "does_not_exist", slug_name="username", value=smart_str(data)
             )
+        return super().to_internal_value(data)
+
+
+class FollowCreateSerializer(FollowSerializer):
+    """Создание подписки без проверочных запросов перед INSERT.
+
+    Автор ищется одним запросом, а повторную подписку отсекает
+    ограничение `unique_follower`. Ошибки совпадают с ошибками
+    `FollowSerializer`.
+    """
+
+    following = UsernameField()
+
+    class Meta(FollowSerializer.Meta):
+        validators = []
+
+    def validate(self, data):
+        if self.context["request"].user.username == data["following"]:
+            raise serializers.ValidationError(SELF_FOLLOW_MESSAGE)
         return data
+
+    def create(self, validated_data):
+        username = validated_data["following"]
+        following = self.get_following(username)
+        if following is None:
+            self.fail_following(username)
+        user = validated_data["user"]
+        try:
+            with transaction.atomic():
+                return Follow.objects.create(user=user, following=following)
+        except IntegrityError:
+            # Ошибку даёт не только `unique_follower`: автора могли
+            # удалить после поиска.
+            if Follow.objects.filter(user=user, following=following).exists():
+                raise serializers.ValidationError(
+                    {"non_field_errors": [FOLLOW_EXISTS_MESSAGE]}
+                )
+            if not User.objects.filter(pk=following.pk).exists():
+                self.fail_following(username)
+            raise
+
+    def get_following(self, username):
+        return User.objects.filter(username=username).only(
+            "pk", "username"
+        ).first()
+
+    def fail_following(self, username):
+        message = UsernameField.default_error_messages["does_not_exist"]
+        raise serializers.ValidationError({"following": [
+            message.format(slug_name="username", value=username)
+        ]})
+
+
+class UserProfileSerializer(serializers.ModelSerializer):
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ("username", "followers_count", "following_count")
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    """Подписчик из списка `/users/{username}/followers/`."""
+
+    username = serializers.SlugRelatedField(
+        source="user",
+        read_only=True,
+        slug_field="username"
+    )
+
+    class Meta:
+        model = Follow
+        fields = ("username",)
+
+
+class FollowingSerializer(FollowerSerializer):
+    """Автор из списка `/users/{username}/following/`."""
+
+    username = serializers.SlugRelatedField(
+        source="following",
+        read_only=True,
+        slug_field="username"
+    )
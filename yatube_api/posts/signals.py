@@ -0,0 +1,102 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_versions
+from .feed import backfill_feed, fan_out_posts, prune_feed
+from .follows import change_follow_counts
+from .images import (
+    acquire_image,
+    release_image,
+    restore_image_file,
+    schedule_variants,
+    variants_ready
+)
+from .models import Comment, Follow, Group, Post
+from .threads import assign_paths
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        fan_out_posts([instance])
+
+
+@receiver(pre_save, sender=Post)
+def post_image_loaded(sender, instance, update_fields=None, **kwargs):
+    # Загруженное содержимое нужно restore_image_file(): после save()
+    # поле указывает уже только на имя в хранилище.
+    image = instance.image
+    instance._uploaded_image = (
+        image.file if image and not image._committed else None
+    )
+    if update_fields is not None and "image" not in update_fields:
+        instance._stored_image = instance.image.name
+        return
+    instance._stored_image = Post.objects.filter(pk=instance.pk).values_list(
+        "image", flat=True
+    ).first() if instance.pk else None
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, **kwargs):
+    previous = getattr(instance, "_stored_image", None) or ""
+    current = instance.image.name or ""
+    if current != previous:
+        if current:
+            acquire_image(current)
+            restore_image_file(current, instance._uploaded_image)
+        if previous:
+            release_image(previous)
+    if instance.image and not variants_ready(instance):
+        schedule_variants(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_image_deleted(sender, instance, **kwargs):
+    if instance.image:
+        release_image(instance.image.name)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created and not instance.path:
+        assign_paths([instance])
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        change_follow_counts(instance.user_id, instance.following_id, 1)
+        backfill_feed(instance.user_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    change_follow_counts(instance.user_id, instance.following_id, -1)
+    prune_feed(instance.user_id, instance.following_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_versions("posts", f"post:{instance.pk}")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_versions(
+        "posts",
+        f"post:{instance.post_id}",
+        f"comments:{instance.post_id}"
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    scopes = ["groups"]
+    if kwargs["signal"] is post_delete:
+        # SET_NULL обновляет посты запросом UPDATE без сигналов.
+        scopes.append("posts")
+    bump_versions(*scopes)
@@ -0,0 +1,57 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, где имя файла — SHA-256 его содержимого.
+
+    Файлы раскладываются по вложенным каталогам из первых символов
+    хеша (`posts/ab/cd/abcd….jpg`), так что в одном каталоге их не
+    больше нескольких тысяч даже при миллионах загрузок. Повторная
+    загрузка того же содержимого не пишет файл заново, а возвращает
+    имя уже сохранённого; учёт ссылок на файлы — в `posts.images`.
+    """
+
+    shard_levels = 2
+    shard_width = 2
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def save_derived(self, name, content):
+        """Сохраняет производный файл, например вариант изображения,
+        точно под именем `name`, заменяя прежний."""
+        if self.exists(name):
+            self.delete(name)
+        return super().save(name, content)
+
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        shards = [
+            digest[index:index + self.shard_width]
+            for index in range(
+                0, self.shard_levels * self.shard_width, self.shard_width
+            )
+        ]
+        _, extension = os.path.splitext(name)
+        return "/".join(
+            [os.path.dirname(name), *shards, digest + extension.lower()]
+        ).lstrip("/")
+
+
+content_storage = ContentAddressedStorage()
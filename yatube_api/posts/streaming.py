@@ -0,0 +1,36 @@
+from django.http import StreamingHttpResponse
+
+from api.renderers import dumps
+
+from .constants import STREAM_CHUNK_SIZE
+
+
+def iter_json_array(queryset, represent, chunk_size=STREAM_CHUNK_SIZE):
+    """Отдаёт выборку JSON-массивом по частям из `chunk_size` строк.
+
+    `represent` превращает пачку строк выборки в список словарей.
+    """
+    separator = b"["
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            yield separator + _encode_batch(represent, batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + _encode_batch(represent, batch)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def _encode_batch(represent, batch):
+    # Пачка кодируется одним вызовом, от массива отрезаются скобки.
+    return dumps(represent(batch))[1:-1]
+
+
+def streaming_json_response(queryset, represent):
+    return StreamingHttpResponse(
+        iter_json_array(queryset, represent),
+        content_type="application/json"
+    )
@@ -0,0 +1,72 @@
+"""Дерево комментариев на материализованном пути.
+
+Путь комментария — путь родителя и собственный id, дополненный нулями
+до `COMMENT_PATH_STEP` цифр. Сортировка по пути даёт обход дерева
+в глубину, а поддерево — диапазон `[path, следующий путь того же
+уровня)` по индексу `(post, path)`. Пути состоят только из цифр,
+поэтому порядок не зависит от правил сравнения строк в СУБД.
+"""
+from django.db.models.functions import Length
+
+from .constants import COMMENT_PATH_STEP
+from .models import Comment
+
+
+def make_path(parent_path, pk):
+    return f"{parent_path}{pk:0{COMMENT_PATH_STEP}d}"
+
+
+def path_depth(path):
+    """Уровень вложенности: 0 у комментария к посту."""
+    return len(path) // COMMENT_PATH_STEP - 1
+
+
+def path_range(path):
+    """Границы путей поддерева: включая `path` и до следующего соседа."""
+    head, last = path[:-COMMENT_PATH_STEP], path[-COMMENT_PATH_STEP:]
+    return path, make_path(head, int(last) + 1)
+
+
+def assign_paths(comments):
+    """Заполняет пути созданных комментариев одним UPDATE.
+
+    Родители должны быть уже загружены и иметь путь.
+    """
+    for comment in comments:
+        parent_path = comment.parent.path if comment.parent_id else ""
+        comment.path = make_path(parent_path, comment.pk)
+    Comment.objects.bulk_update(comments, ["path"])
+
+
+def tree_queryset(queryset, root_path=None, depth=None):
+    """Комментарии в порядке обхода дерева.
+
+    Без `root_path` — всё дерево выборки, иначе поддерево с корнем
+    `root_path`. `depth` ограничивает число уровней ниже верхнего
+    уровня выдачи.
+    """
+    # Длина пути самого верхнего уровня выдачи.
+    base_length = COMMENT_PATH_STEP
+    if root_path is not None:
+        lower, upper = path_range(root_path)
+        queryset = queryset.filter(path__gte=lower, path__lt=upper)
+        base_length = len(root_path)
+    if depth is not None:
+        queryset = queryset.alias(path_length=Length("path")).filter(
+            path_length__lte=base_length + depth * COMMENT_PATH_STEP
+        )
+    return queryset.order_by("path")
+
+
+def nest(items, paths):
+    """Собирает плоский список в порядке путей в дерево `replies`."""
+    roots = []
+    stack = []
+    for item, path in zip(items, paths):
+        item["replies"] = []
+        while stack and not path.startswith(stack[-1][0]):
+            stack.pop()
+        siblings = stack[-1][1]["replies"] if stack else roots
+        siblings.append(item)
+        stack.append((path, item))
+    return roots
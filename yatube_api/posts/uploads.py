@@ -0,0 +1,91 @@
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+from .constants import (
+    IMAGE_FORMATS,
+    IMAGE_MAX_PIXELS,
+    IMAGE_MAX_UPLOAD_SIZE,
+    IMAGE_UPLOAD_CHUNK_SIZE
+)
+
+TOO_LARGE_MESSAGE = "Файл больше {} МБ.".format(IMAGE_MAX_UPLOAD_SIZE >> 20)
+TOO_MANY_PIXELS_MESSAGE = "Изображение больше {} Мпикс.".format(
+    IMAGE_MAX_PIXELS // 10 ** 6
+)
+INVALID_IMAGE_MESSAGE = (
+    "Загрузите изображение в одном из форматов: {}.".format(
+        ", ".join(IMAGE_FORMATS)
+    )
+)
+
+
+def check_upload_size(size):
+    if size is not None and size > IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(TOO_LARGE_MESSAGE)
+
+
+def probe_image(file, complete=True):
+    """Формат и размеры изображения по заголовку, без декодирования.
+
+    Для недокачанного файла (`complete=False`) возвращает None, если
+    заголовка пока не хватает для распознавания.
+    """
+    position = file.tell()
+    file.seek(0)
+    try:
+        # Image.open() читает только заголовок; пиксели не декодируются.
+        with Image.open(file) as image:
+            image_format, size = image.format, image.size
+    except Image.DecompressionBombError:
+        raise ValidationError(TOO_MANY_PIXELS_MESSAGE)
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        if not complete:
+            return None
+        raise ValidationError(INVALID_IMAGE_MESSAGE)
+    finally:
+        file.seek(position)
+    if image_format not in IMAGE_FORMATS:
+        raise ValidationError(INVALID_IMAGE_MESSAGE)
+    if size[0] * size[1] > IMAGE_MAX_PIXELS:
+        raise ValidationError(TOO_MANY_PIXELS_MESSAGE)
+    return image_format, size
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Принимает изображения во временный файл частями фиксированного
+    размера, не держа их в памяти.
+
+    Загрузка обрывается, как только превышен размер файла или по
+    заголовку видно, что формат не тот или пикселей слишком много.
+    Проверенные формат и размеры сохраняются в `file.image_info`.
+    """
+
+    chunk_size = IMAGE_UPLOAD_CHUNK_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.image_info = None
+        self.check(check_upload_size, self.content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.check(check_upload_size, self.received)
+        self.file.write(raw_data)
+        if start == 0:
+            self.image_info = self.check(probe_image, self.file, False)
+
+    def file_complete(self, file_size):
+        if self.image_info is None:
+            self.image_info = self.check(probe_image, self.file)
+        file = super().file_complete(file_size)
+        file.image_info = self.image_info
+        return file
+
+    def check(self, validator, *args):
+        try:
+            return validator(*args)
+        except ValidationError as error:
+            self.upload_interrupted()
+            raise ValidationError({self.field_name: error.detail})
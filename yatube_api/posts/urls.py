@@ -3,15 +3,19 @@ from rest_framework.routers import DefaultRouter
 
 from posts.views import (
     CommentViewSet,
+    FeedViewSet,
     FollowViewSet,
     GroupViewSet,
-    PostViewSet
+    PostViewSet,
+    UserViewSet
 )
 
 router_v1 = DefaultRouter()
 router_v1.register("posts", PostViewSet, basename="posts")
 router_v1.register("groups", GroupViewSet, basename="groups")
 router_v1.register("follow", FollowViewSet, basename="follow")
+router_v1.register("feed", FeedViewSet, basename="feed")
+router_v1.register("users", UserViewSet, basename="users")
 router_v1.register(
     r"posts/(?P<post_id>\d+)/comments",
     CommentViewSet,
@@ -1,77 +1,302 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, viewsets
+from rest_framework import filters, mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly
 )
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import LimitOffsetPagination, _positive_int
 from rest_framework.response import Response
 
-from .models import Follow, Group, Post
+from .cache import bump_versions, cache_response, conditional_response
+from .constants import (
+    COMMENT_MAX_DEPTH,
+    COMMENT_TREE_MAX_ITEMS,
+    EXPAND_COMMENTS_LIMIT,
+    EXPAND_COMMENTS_MAX_LIMIT
+)
+from .expand import attach_latest_comments
+from .feed import fan_out_posts, timeline_sources
+from .mixins import (
+    BulkCreateMixin,
+    EagerLoadingMixin,
+    ListPaginatorMixin,
+    ValuesListMixin,
+    ValuesRepresentationMixin
+)
+from .models import Comment, Follow, Group, Post, User
+from .pagination import (
+    CommentCursorPagination,
+    FeedPagination,
+    FollowCursorPagination,
+    PostCursorPagination
+)
 from .serializers import (
     PostSerializer,
     CommentSerializer,
     GroupSerializer,
-    FollowSerializer
+    FollowCreateSerializer,
+    FollowSerializer,
+    FollowerSerializer,
+    FollowingSerializer,
+    UserProfileSerializer
 )
 from .permissions import IsOwnerOrReadOnly
+from .search import PostSearchFilter
+from .streaming import streaming_json_response
+from .threads import assign_paths, nest, tree_queryset
+from .uploads import ImageUploadHandler
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(BulkCreateMixin, ListPaginatorMixin, ValuesListMixin,
+                  EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
+    select_related_fields = ('author',)
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly,
     )
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filter_backends = (DjangoFilterBackend, PostSearchFilter)
     filterset_fields = ('group',)
     search_fields = ('text',)
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Обработчики загрузки задаются до разбора тела запроса.
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+    def get_bulk_create_kwargs(self):
+        return {'author': self.request.user}
+
+    def after_bulk_create(self, objects):
+        fan_out_posts(objects)
+        bump_versions('posts')
+
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            return (f'post:{self.kwargs[self.lookup_field]}',)
+        return ('posts',)
 
-        if 'limit' in request.query_params or 'offset' in request.query_params:
-            paginator = LimitOffsetPagination()
-            page = paginator.paginate_queryset(queryset, request, view=self)
+    def get_list_paginator(self):
+        params = self.request.query_params
+        if PostCursorPagination.cursor_query_param in params:
+            return PostCursorPagination()
+        if 'limit' in params or 'offset' in params:
+            return LimitOffsetPagination()
+        return None
 
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+    def get_comments_limit(self):
+        """Число комментариев для `?expand=comments` или None."""
+        params = self.request.query_params
+        if 'comments' not in params.get('expand', '').split(','):
+            return None
+        try:
+            return _positive_int(
+                params['comments_limit'], cutoff=EXPAND_COMMENTS_MAX_LIMIT
+            )
+        except (KeyError, ValueError):
+            return EXPAND_COMMENTS_LIMIT
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def get_list_lookups(self):
+        lookups = super().get_list_lookups()
+        if self.get_comments_limit() is not None:
+            lookups.append('id')
+        return lookups
 
+    def represent_list(self, items):
+        limit = self.get_comments_limit()
+        if limit is None:
+            return super().represent_list(items)
+        items = list(items)
+        return attach_latest_comments(
+            super().represent_list(items),
+            [item['id'] if isinstance(item, dict) else item.pk
+             for item in items],
+            limit
+        )
 
-class CommentViewSet(viewsets.ModelViewSet):
+    @conditional_response
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        if (
+            self.paginator is None
+            and request.query_params.get('stream') in ('1', 'true')
+        ):
+            return streaming_json_response(
+                self.get_list_queryset(), self.represent_list
+            )
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class CommentViewSet(BulkCreateMixin, ListPaginatorMixin, ValuesListMixin,
+                     EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    select_related_fields = ('author',)
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly,
     )
-    pagination_class = None
 
     def get_queryset(self):
-        post = Post.objects.get(pk=self.kwargs.get('post_id'))
-        return post.comments.all()
+        return Comment.objects.filter(
+            post_id=self.kwargs.get('post_id')
+        ).order_by('created', 'id')
+
+    def get_list_paginator(self):
+        params = self.request.query_params
+        if CommentCursorPagination.cursor_query_param in params:
+            return CommentCursorPagination()
+        return None
 
+    def get_cache_scopes(self):
+        post_id = self.kwargs['post_id']
+        return (f'comments:{post_id}', f'post:{post_id}')
+
+    def check_post_exists(self):
+        if not Post.objects.filter(pk=self.kwargs.get('post_id')).exists():
+            raise NotFound('Пост не найден.')
+
+    def represent_list(self, items):
+        # Непустой список уже доказывает, что пост есть; отдельный
+        # запрос нужен только для пустого.
+        items = list(items)
+        if not items:
+            self.check_post_exists()
+        return super().represent_list(items)
+
+    @conditional_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, url_path='tree')
+    @conditional_response
+    def tree(self, request, *args, **kwargs):
+        return self.tree_response()
+
+    @action(detail=True, url_path='tree')
+    @conditional_response
+    def subtree(self, request, *args, **kwargs):
+        path = self.get_queryset().filter(
+            pk=self.kwargs[self.lookup_field]
+        ).values_list('path', flat=True).first()
+        if path is None:
+            raise NotFound('Комментарий не найден.')
+        return self.tree_response(path)
+
+    def tree_response(self, root_path=None):
+        """Дерево или поддерево одним запросом по индексу `(post, path)`.
+
+        `?depth=N` ограничивает вложенность, `?limit=N` — число
+        комментариев, `?flat=1` отдаёт список в порядке обхода.
+        """
+        params = self.request.query_params
+        depth = self.get_tree_param('depth', None, COMMENT_MAX_DEPTH)
+        limit = self.get_tree_param(
+            'limit', COMMENT_TREE_MAX_ITEMS, COMMENT_TREE_MAX_ITEMS
+        )
+        queryset = tree_queryset(
+            self.filter_queryset(self.get_queryset()), root_path, depth
+        )
+        representation = self.get_list_representation()
+        if representation is not None:
+            queryset = representation.get_queryset(queryset, ['path'])
+        rows = list(queryset[:limit])
+        items = self.represent_list(rows)
+        if params.get('flat') in ('1', 'true'):
+            return Response(items)
+        return Response(nest(items, [
+            row['path'] if isinstance(row, dict) else row.path
+            for row in rows
+        ]))
+
+    def get_tree_param(self, name, default, cutoff):
+        try:
+            return _positive_int(
+                self.request.query_params[name], cutoff=cutoff
+            )
+        except (KeyError, ValueError):
+            return default
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        post = Post.objects.get(pk=self.kwargs.get('post_id'))
-        serializer.save(author=self.request.user, post=post)
+        post_id = self.kwargs.get('post_id')
+        # Число обновлённых строк заодно проверяет, что пост существует.
+        if not Post.objects.filter(pk=post_id).update(
+            comment_count=F('comment_count') + 1
+        ):
+            raise NotFound('Пост не найден.')
+        serializer.save(author=self.request.user, post_id=int(post_id))
+
+    def perform_bulk_create(self, serializer):
+        post_id = self.kwargs.get('post_id')
+        updated = Post.objects.filter(pk=post_id).update(
+            comment_count=F('comment_count') + len(serializer.validated_data)
+        )
+        if not updated:
+            raise NotFound('Пост не найден.')
+        return super().perform_bulk_create(serializer)
+
+    def get_bulk_create_kwargs(self):
+        return {
+            'author': self.request.user,
+            'post_id': int(self.kwargs.get('post_id')),
+        }
 
+    def after_bulk_create(self, objects):
+        # bulk_create не шлёт post_save, пути задаются здесь.
+        assign_paths(objects)
+        post_id = self.kwargs.get('post_id')
+        bump_versions('posts', f'post:{post_id}', f'comments:{post_id}')
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Вместе с комментарием каскадом удаляются ответы на него.
+        _, deleted = instance.delete()
+        count = deleted.get(Comment._meta.label, 1)
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=Greatest(F('comment_count') - count, 0)
+        )
+
+
+class GroupViewSet(ValuesListMixin, EagerLoadingMixin,
+                   viewsets.ReadOnlyModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
     pagination_class = None
 
+    def get_cache_scopes(self):
+        return ('groups',)
+
+    @conditional_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
-class FollowViewSet(viewsets.ModelViewSet):
+    @conditional_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class FollowViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     serializer_class = FollowSerializer
+    select_related_fields = ('user', 'following')
     permission_classes = (IsAuthenticated,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('following__username',)
@@ -80,5 +305,79 @@ class FollowViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Follow.objects.filter(user=self.request.user)
 
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return FollowCreateSerializer
+        return FollowSerializer
+
+    @transaction.atomic
     def perform_create(self, serializer):
+        # Счётчики FollowStats обновляются сигналом в той же транзакции.
         serializer.save(user=self.request.user)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+class UserViewSet(ValuesRepresentationMixin, mixins.RetrieveModelMixin,
+                  viewsets.GenericViewSet):
+    """Профиль пользователя со счётчиками подписок и списки
+    подписчиков и подписок с курсорной пагинацией по id подписки.
+    """
+
+    lookup_field = 'username'
+    lookup_value_regex = r'[\w.@+-]+'
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = FollowCursorPagination
+
+    def get_queryset(self):
+        username = self.kwargs.get(self.lookup_field)
+        if self.action == 'followers':
+            return Follow.objects.filter(following__username=username)
+        if self.action == 'following':
+            return Follow.objects.filter(user__username=username)
+        return User.objects.annotate(
+            followers_count=Coalesce('follow_stats__followers', 0),
+            following_count=Coalesce('follow_stats__following', 0)
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'followers':
+            return FollowerSerializer
+        if self.action == 'following':
+            return FollowingSerializer
+        return UserProfileSerializer
+
+    def represent_list(self, items):
+        items = list(items)
+        if not items and not User.objects.filter(
+            username=self.kwargs.get(self.lookup_field)
+        ).exists():
+            raise NotFound('Пользователь не найден.')
+        return super().represent_list(items)
+
+    @action(detail=True)
+    def followers(self, request, *args, **kwargs):
+        return self.list_values()
+
+    @action(detail=True)
+    def following(self, request, *args, **kwargs):
+        return self.list_values()
+
+
+class FeedViewSet(EagerLoadingMixin, viewsets.GenericViewSet):
+    queryset = Post.objects.all()
+    serializer_class = PostSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = FeedPagination
+    select_related_fields = ('author',)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_sources(
+            timeline_sources(request.user),
+            self.filter_queryset(self.get_queryset()),
+            request
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
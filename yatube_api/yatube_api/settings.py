@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -59,6 +61,16 @@ DATABASES = {
     }
 }
 
+# Для разработки. В продакшене кеш должен быть общим для процессов
+# (Redis, Memcached): в нём лежат пользователи JWT и счётчики
+# ограничения частоты запросов, и их должны видеть все процессы.
+# Вне DEBUG это требует проверка api.E001.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -84,16 +96,59 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+MEDIA_URL = "/media/"
+MEDIA_ROOT = BASE_DIR / "media"
 
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttling.UserReadThrottle",
+        "api.throttling.UserWriteThrottle",
+        "api.throttling.AnonReadThrottle",
+        "api.throttling.AnonWriteThrottle",
+        "api.throttling.JWTCreateThrottle",
     ],
+    "DEFAULT_THROTTLE_RATES": {
+        "user_read": "1000/min",
+        "user_write": "120/min",
+        "anon_read": "300/min",
+        "anon_write": "30/min",
+        "jwt_create": "10/min",
+    },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
 }
 
+# Счётчики ограничения частоты запросов должны быть общими для всех
+# процессов: они лежат в кеше по умолчанию, который в продакшене общий
+# (Redis, Memcached). Для процессов одной машины без общего кеша
+# подойдёт api.throttling.SQLiteCounterStore с OPTIONS {"path": ...}.
+THROTTLE_COUNTER_STORE = {
+    "BACKEND": "api.throttling.CacheCounterStore",
+}
+
+SIMPLE_JWT = {
+    "AUTH_TOKEN_CLASSES": ("api.tokens.RevocableAccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "api.serializers.RevocableTokenRefreshSerializer"
+    ),
+    "TOKEN_VERIFY_SERIALIZER": "api.serializers.RevocableTokenVerifySerializer",
+}
+
+if find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "api.renderers.MessagePackRenderer"
+    )
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.views.generic import TemplateView
 
+from api.views import serve_static
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path(
@@ -11,3 +14,11 @@ urlpatterns = [
     ),
     path("api/", include("api.urls")),
 ]
+
+if settings.DEBUG:
+    # В продакшене STATIC_ROOT отдаёт веб-сервер, см. README.
+    urlpatterns.append(re_path(
+        rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.*)$",
+        serve_static,
+        name="static"
+    ))